@@ -27,10 +27,21 @@ Prerequisites:
 Setup:
 1. Install dependencies: pip install -r requirements.txt
 2. Set your Gemini API key in the script or environment variable
+3. Optionally set GEMINI_MAX_WORKERS to control how many files are analyzed
+   concurrently (default: 8). Lower it if you hit Gemini rate limits.
+4. Optionally set GEMINI_CLASSIFY_MODEL to a smaller, faster model for per-file
+   analysis (default: GEMINI_MODEL).
+5. Gemini responses are cached in ~/.cache/commit-ai (override with COMMIT_AI_CACHE_DIR)
+   for COMMIT_AI_CACHE_DAYS days (default: 7). Pass --no-cache to ignore the cache.
+6. Optionally install orjson (pip install orjson) for faster JSON handling.
+7. Optionally set GEMINI_RPM / GEMINI_TPM to your tier's requests and tokens per
+   minute; calls are then paced to stay under them.
 
 Usage:
     python analysis.py commit --repo-path='/path/to/your/repo'
     python analysis.py commit --repo-path='/path/to/your/repo' --auto-mode
+    python analysis.py commit --repo-path='/path/to/your/repo' --analysis-batch-size=5
+    python analysis.py commit --repo-path='/path/to/your/repo' --no-cache
     python analysis.py test --file='src/component.tsx' --repo-path='/path/to/your/repo'
     python analysis.py summarize --base-branch='main' --repo-path='/path/to/your/repo'
 """
@@ -39,27 +50,110 @@ import os
 import sys
 import subprocess
 import json
-import fire
-import questionary
-import google.generativeai as genai
-from collections import defaultdict
-from typing import Dict, List, Optional, Set
-from retry import retry
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Collection, Dict, FrozenSet, List, Optional, Set, Tuple, TypedDict
 from dotenv import load_dotenv
 import re
+import hashlib
+import itertools
 import logging
+import logging.handlers
+import queue
+import atexit
+import sqlite3
+import random
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+# orjson is optional: when installed it parses Gemini responses and (de)serializes cache
+# and session journal entries several times faster than json. Its decode errors subclass json.JSONDecodeError.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(value) -> str:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except TypeError:  # e.g. lone surrogates from file names that are not valid UTF-8
+            return json.dumps(value)
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
 # Load environment variables
 load_dotenv()
 
 # --- Configuration ---
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 GEMINI_MODEL = os.getenv('GEMINI_MODEL')
-
-# Configure Gemini
-genai.configure(api_key=GEMINI_API_KEY)
+# Per-file classification is a small task; a lighter model (e.g. a Flash-Lite variant)
+# is usually enough. Commit messages, reviews and summaries keep GEMINI_MODEL.
+GEMINI_CLASSIFY_MODEL = os.getenv('GEMINI_CLASSIFY_MODEL') or GEMINI_MODEL
+
+# Where Gemini responses are cached between runs
+CACHE_DIR = os.getenv('COMMIT_AI_CACHE_DIR') or os.path.join(
+    os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'commit-ai'
+)
+# Cached responses older than this many days are dropped when the cache is opened
+CACHE_MAX_AGE_DAYS = int(os.getenv('COMMIT_AI_CACHE_DAYS', '7'))
+
+# Number of largest groups whose commit messages are generated ahead of selection
+PREFETCH_GROUPS = 3
+
+# Bump when the analysis prompt or result shape changes so stale cache entries are ignored
+ANALYSIS_PROMPT_VERSION = 'v2'
+# Same, for the commit message and review prompts built from a group's diff
+GROUP_PROMPT_VERSION = 'v3'
+
+# Longest list of paths passed on one git command line; well under Windows' 32K
+# character limit (Linux allows far more)
+GIT_ARGV_MAX_CHARS = 24000
+
+# Maximum number of files analyzed concurrently (bounded by your Gemini rate limits)
+GEMINI_MAX_WORKERS = max(1, int(os.getenv('GEMINI_MAX_WORKERS', '8')))
+# Upper bound on files per analysis request when the batch size is chosen automatically
+MAX_ANALYSIS_BATCH_SIZE = 20
+
+# Retries for Gemini rate limits (429), with exponential backoff capped at the max delay;
+# a retry delay sent by the server takes precedence
+GEMINI_RATE_LIMIT_RETRIES = 4
+GEMINI_RATE_LIMIT_BASE_DELAY = 2.0
+GEMINI_RATE_LIMIT_MAX_DELAY = 60.0
+# Retries for transient Gemini errors (503/504), with a short linear delay
+GEMINI_TRANSIENT_RETRIES = 2
+GEMINI_TRANSIENT_DELAY = 1.0
+
+# Optional client-side pacing to your Gemini tier's requests and tokens per minute (0 = off).
+# Calls are spread to RATE_LIMIT_HEADROOM of each limit; tokens are estimated as chars / 4.
+GEMINI_RPM = int(os.getenv('GEMINI_RPM', '0'))
+GEMINI_TPM = int(os.getenv('GEMINI_TPM', '0'))
+RATE_LIMIT_HEADROOM = 0.8
+
+# Gemini SDK, imported and configured on first use by _load_genai
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def _load_genai():
+    """Imports and configures google.generativeai the first time it is needed.
+
+    The SDK pulls in gRPC and protobuf, the bulk of this script's startup time.
+    Deferring it keeps `--help` fast and lets the warm-up thread pay for the
+    import while the main thread is busy with git.
+    """
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            import google.generativeai as genai
+            genai.configure(api_key=GEMINI_API_KEY)
+            _genai = genai
+        return _genai
 
 # ANSI color codes for better terminal output
 class Colors:
@@ -73,11 +167,199 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
-# Files to be committed automatically with generic messages
-GENERIC_DEPENDENCY_FILES = ['package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'poetry.lock', 'Pipfile.lock']
+# ANSI codes are only emitted to a terminal, and never when NO_COLOR is set
+USE_COLOR = sys.stdout.isatty() and os.getenv('NO_COLOR') is None
+if not USE_COLOR:
+    for _name in [name for name in vars(Colors) if name.isupper()]:
+        setattr(Colors, _name, '')
+
+# Files to be committed automatically with generic messages: dependency lock files...
+DEPENDENCY_FILE_RE = re.compile(
+    r'(^|/)(package-lock\.json|yarn\.lock|pnpm-lock\.yaml|poetry\.lock|Pipfile\.lock'
+    r'|Cargo\.lock|go\.sum|composer\.lock)$'
+)
+# ...and generated build output; only root-level dist/ and build/ count, since nested
+# directories with those names (tools/build/, src/dist/) usually hold hand-written source
+GENERATED_FILE_RE = re.compile(
+    r'^(dist|build)/|(^|/)__generated__/|\.(min\.(js|css)|generated\.(ts|js)|snap)$'
+)
 
 # Image file extensions to auto-commit
-IMAGE_FILE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.svg', '.gif', '.webp', '.ico', '.bmp']
+IMAGE_FILE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.svg', '.gif', '.webp', '.ico', '.bmp')
+
+# Commit message prefixes for groups that get a fixed message instead of a Gemini call
+# (see _trivial_group_kind)
+TRIVIAL_COMMIT_PREFIXES = {
+    'binary': 'chore(assets): update',
+    'image': 'chore(assets): update',
+    'lockfile': 'chore(deps): update',
+    'whitespace': 'style: reformat',
+}
+
+# Files where leading whitespace carries meaning, so reindenting them is never a style-only change
+INDENT_SIGNIFICANT_EXTENSIONS = ('.py', '.pyi', '.pyw', '.yaml', '.yml', '.mk', '.sass', '.pug', '.haml', '.coffee')
+INDENT_SIGNIFICANT_NAMES = frozenset({'makefile', 'gnumakefile'})
+
+# Files classified by path alone, without asking Gemini
+DOC_FILE_EXTENSIONS = ('.md', '.rst', '.txt', '.adoc')
+FONT_FILE_EXTENSIONS = ('.woff', '.woff2', '.ttf', '.otf', '.eot')
+TEST_DIR_NAMES = ('test', 'tests', '__tests__', 'spec', 'specs')
+TEST_FILE_RE = re.compile(r'(^test_.*\.py$|_test\.(py|go)$|\.(test|spec)\.[jt]sx?$)')
+
+# Most commits sampled by summarize_recent, and the patch bytes shared between them
+RECENT_SUMMARY_MAX_COMMITS = 20
+RECENT_SUMMARY_DIFF_BYTES = 6000
+
+# Character budgets (head, tail) for content sent to Gemini. Large inputs keep their
+# beginning and end; the middle is replaced by a snip marker.
+ANALYSIS_CHAR_BUDGET = (1600, 400)
+GROUP_DIFF_CHAR_BUDGET = (12288, 4096)
+# Per file within a group diff, so one large file cannot push the others out of it
+FILE_PATCH_CHAR_BUDGET = (6144, 2048)
+
+# Static instructions shared by every per-file analysis prompt. Keeping them as the
+# prompt prefix (with the file-specific part appended last) lets Gemini reuse its
+# cached prefix across files instead of re-processing the instructions each call.
+FILE_ANALYSIS_PROMPT_PREFIX = """You are an expert software engineer analyzing changes in a git repository.
+Analyze the file given at the end of this prompt (new file content or a git diff).
+
+Return ONLY a valid JSON object with:
+1. "summary": Brief description of the file's purpose or of what changed
+2. "keywords": Array of 2-4 keywords categorizing the change
+3. "feature_area": The main feature/component this file belongs to
+4. "dependencies": Array of file patterns this might depend on or affect
+5. "impact_level": "low", "medium", or "high" based on change significance
+6. "file_type": Type of file (component, service, utility, config, etc.)
+7. "change_type": Type of change (new_file, feature, bugfix, refactor, etc.)
+"""
+
+# Instructions for analyzing several files in one request; each file section follows
+BATCH_ANALYSIS_PROMPT_PREFIX = """You are an expert software engineer analyzing changes in a git repository.
+Analyze EACH file given at the end of this prompt (new file content or a git diff).
+File sections are separated by lines containing only ---.
+
+Return ONLY a valid JSON object of the form {"analyses": [...]} with one entry per file, where each entry has:
+0. "file": The file path exactly as given
+1. "summary": Brief description of the file's purpose or of what changed
+2. "keywords": Array of 2-4 keywords categorizing the change
+3. "feature_area": The main feature/component this file belongs to
+4. "dependencies": Array of file patterns this might depend on or affect
+5. "impact_level": "low", "medium", or "high" based on change significance
+6. "file_type": Type of file (component, service, utility, config, etc.)
+7. "change_type": Type of change (new_file, feature, bugfix, refactor, etc.)
+"""
+
+# Static instructions for the commit message prompt; the group's files and diff follow
+COMMIT_MESSAGE_PROMPT_PREFIX = """Generate a conventional commit message for the changes given at the end of this prompt.
+
+Requirements:
+1. Use conventional commit format: type(scope): description
+2. Types: feat, fix, docs, style, refactor, test, chore
+3. Keep description under 50 characters
+4. Add body if needed for complex changes
+5. Consider the group context when determining scope
+
+Return ONLY the commit message as plain text, no markdown formatting.
+Example: "feat(auth): implement JWT token validation"
+"""
+
+# Static instructions for the code review prompt; the group's files and diff follow
+REVIEW_PROMPT_PREFIX = """Perform a code review on the changes given at the end of this prompt.
+
+Review for:
+1. Logic errors or bugs
+2. Security vulnerabilities
+3. Performance issues
+4. Code style and best practices
+5. Missing error handling
+6. Potential side effects
+
+Return ONLY a JSON array of review comments. If no issues found, return empty array.
+Example: ["Consider adding error handling for API calls", "This function could benefit from input validation"]
+"""
+
+# Static instructions for the test skeleton prompt; the file name and its diff follow
+TEST_PROMPT_PREFIX = """Generate a comprehensive test skeleton for the changes given at the end of this prompt.
+
+Requirements:
+1. Create test cases for main functionality
+2. Include edge cases and error scenarios
+3. Use appropriate testing framework syntax
+4. Add descriptive test names
+5. Include setup/teardown if needed
+6. Add TODO comments for complex logic
+
+Return the test code as plain text.
+"""
+
+# Static instructions for the pull request summary prompt; the branch diff follows
+PR_SUMMARY_PROMPT_PREFIX = """Generate a comprehensive Pull Request summary for the branch diff given at the end of this prompt.
+
+Create:
+1. **Title**: Concise PR title
+2. **Summary**: High-level overview of changes
+3. **Changes**: Bulleted list of key modifications
+4. **Impact**: Potential effects on the system
+5. **Testing**: Suggested testing approach
+6. **Deployment**: Any deployment considerations
+
+Format as clean Markdown.
+"""
+
+# Response schemas for Gemini's constrained JSON output; they mirror the prompts above and
+# enforce the response shape, so the prompts carry no example responses
+class FileAnalysisSchema(TypedDict):
+    summary: str
+    keywords: List[str]
+    feature_area: str
+    dependencies: List[str]
+    impact_level: str
+    file_type: str
+    change_type: str
+
+
+class BatchFileAnalysisSchema(FileAnalysisSchema):
+    file: str
+
+
+class BatchAnalysisSchema(TypedDict):
+    analyses: List[BatchFileAnalysisSchema]
+
+
+# Fields every analysis must contain before it is accepted
+REQUIRED_ANALYSIS_FIELDS = ("summary", "keywords", "feature_area")
+
+# Git's well-known empty tree, used as the diff base before the first commit
+EMPTY_TREE_SHA = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+
+# Bytes sampled from the start and end of a file for analysis; prompts only keep
+# the head and tail of the content (see ANALYSIS_CHAR_BUDGET), so the middle is never read
+FILE_SAMPLE_HEAD = 8 * 1024
+FILE_SAMPLE_TAIL = 2 * 1024
+# Ends the marker left where the middle of a sampled file or diff was skipped
+SAMPLE_GAP_MARKER = " bytes not read>...\n"
+
+# New files larger than this are classified by path instead of being sent to Gemini
+ANALYSIS_MAX_FILE_BYTES = 200 * 1024
+
+# Bytes sampled from the start and end of an untracked file for its synthetic "new file"
+# patch; sized to cover GROUP_DIFF_CHAR_BUDGET, since the rest would be truncated anyway
+NEW_FILE_PATCH_HEAD = 16 * 1024
+NEW_FILE_PATCH_TAIL = 4 * 1024
+
+# Keywords too generic to link files into the same feature group
+GENERIC_KEYWORDS = frozenset({
+    'bugfix', 'fix', 'feature', 'refactor', 'update', 'chore', 'new_file', 'misc', 'config', 'source',
+})
+
+# Splits a multi-file `git diff` into per-file patches (captures the b/ path)
+DIFF_HEADER_RE = re.compile(r'^diff --git a/.* b/(.*)$', re.MULTILINE)
+# The same, for raw git output that is split before being decoded
+DIFF_HEADER_BYTES_RE = re.compile(DIFF_HEADER_RE.pattern.encode(), re.MULTILINE)
+# Lines of a file's prompt section that name the file itself, before its content or first hunk
+SECTION_HEADER_PREFIXES = ('New file: ', 'Modified file: ', 'File: ', 'diff --git ', '--- ', '+++ ')
+# Hunk headers and blob index lines, whose numbers shift without the change itself changing
+DIFF_POSITION_LINE_RE = re.compile(r'^(@@ [^@]* @@.*|index [0-9a-f]+\.\.[0-9a-f]+.*)$')
 
 # File patterns that suggest dependencies or related features
 DEPENDENCY_PATTERNS = {
@@ -89,15 +371,178 @@ DEPENDENCY_PATTERNS = {
     'types': ['.d.ts', 'types', 'interfaces'],
     'build': ['webpack', 'rollup', 'vite', 'tsconfig', 'babel', 'eslint', 'prettier'],
 }
+# One case-insensitive alternation per category, so each path is matched in a single pass
+DEPENDENCY_PATTERN_RES = {
+    category: re.compile('|'.join(map(re.escape, patterns)), re.IGNORECASE)
+    for category, patterns in DEPENDENCY_PATTERNS.items()
+}
+
+# Compiled once: these run on every log line or every Gemini response
+ANSI_ESCAPE_RE = re.compile(r'\033\[[0-9;]*m')
+INLINE_CODE_RE = re.compile(r'`([^`]+)`')
+LIST_MARKER_RE = re.compile(r'^(?:[-*+]\s*)?(?:\d+\.\s*)?')
+
+# Parses a JSON value starting at a given offset, for arrays embedded in prose or fences
+JSON_DECODER = json.JSONDecoder()
+
+class PlainFormatter(logging.Formatter):
+    """Formatter that strips ANSI color codes, so colored console messages log as plain text."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return ANSI_ESCAPE_RE.sub('', super().format(record))
+
+
+class RateLimiter:
+    """Token buckets that pace calls under per-minute request and token limits.
+
+    Callers reserve capacity under a lock and sleep outside it, so concurrent
+    workers queue up behind each other instead of bursting past the limit.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0,
+                 headroom: float = RATE_LIMIT_HEADROOM):
+        # [refill per second, capacity, level] for each limit; a zero limit is not enforced
+        self._buckets = [[limit * headroom / 60, limit * headroom, limit * headroom]
+                         for limit in (requests_per_minute, tokens_per_minute)]
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Blocks until one request of about `tokens` tokens fits under both limits."""
+        wait = 0.0
+        with self._lock:
+            now = time.monotonic()
+            elapsed, self._stamp = now - self._stamp, now
+            for bucket, cost in zip(self._buckets, (1, tokens)):
+                rate, capacity, level = bucket
+                if not rate:
+                    continue
+                bucket[2] = level = min(capacity, level + elapsed * rate) - min(cost, capacity)
+                if level < 0:
+                    wait = max(wait, -level / rate)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """Exact-match cache of parsed Gemini responses, stored in SQLite.
+
+    Entries are keyed by a BLAKE2 hash of everything that determines the response
+    (model, prompt version and prompt), so identical inputs across runs skip the API
+    call entirely. A single connection is shared between threads behind a lock, and
+    entries read or written this session are also kept in memory (as JSON text, so
+    callers always get a fresh copy they are free to mutate). Entries older than
+    max_age_days are pruned on open. With enabled set to False, lookups always miss
+    but new responses are still stored.
+    """
+
+    def __init__(self, cache_dir: str, max_age_days: int = CACHE_MAX_AGE_DAYS):
+        self._lock = threading.Lock()
+        self._conn = None
+        self._memory: Dict[str, str] = {}
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(cache_dir, 'analyses.sqlite'), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS responses (hash TEXT PRIMARY KEY, json TEXT, ts INT)")
+            self._conn.execute("DELETE FROM responses WHERE ts < ?", (int(time.time()) - max_age_days * 86400,))
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"{Colors.WARNING}Response cache disabled: {e}{Colors.ENDC}")
+            self._conn = None
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Builds a cache key from the inputs that determine a response."""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update((part or '').encode('utf-8', errors='ignore'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Returns the cached value for key, or None on a miss."""
+        with self._lock:
+            if not self.enabled:
+                self.misses += 1
+                return None
+            text = self._memory.get(key)
+            if text is None and self._conn is not None:
+                row = self._conn.execute("SELECT json FROM responses WHERE hash = ?", (key,)).fetchone()
+                if row:
+                    text = self._memory[key] = row[0]
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json_loads(text)
+
+    def set(self, key: str, value) -> None:
+        """Stores a JSON-serializable value under key."""
+        text = json_dumps(value)
+        with self._lock:
+            self._memory[key] = text
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (hash, json, ts) VALUES (?, ?, ?)",
+                (key, text, int(time.time()))
+            )
+            self._conn.commit()
+
 
 class EnhancedGitAICommitter:
     """Enhanced Git AI Committer with Gemini integration and intelligent file batching."""
     
     def __init__(self):
-        self.gemini_model = genai.GenerativeModel(GEMINI_MODEL)
+        # Gemini clients by model name, created on first use (see gemini_model)
+        self._models: Dict[str, object] = {}
+        self._model_lock = threading.Lock()
         self.colors = Colors()
         self.logger = None
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
+        self.response_cache = ResponseCache(CACHE_DIR)
+        self.rate_limiter = RateLimiter(GEMINI_RPM, GEMINI_TPM)
+        # Per-file patches against HEAD, shared by every group that includes the file
+        self._file_patches: Dict[str, str] = {}
+        self._patch_lock = threading.Lock()
+        self._repos_with_head: Set[str] = set()
+        # Untracked paths from the latest _scan_status; only these get synthetic "new file" patches
+        self._untracked_paths: FrozenSet[str] = frozenset()
+        self._verified_repos: Set[str] = set()
+        # Absolute .git directory of each verified repository, from the prerequisites probe
+        self._git_dirs: Dict[str, str] = {}
+        # Shared by every analysis pass in the session; one extra slot for the batched git diff
+        self._analysis_executor = ThreadPoolExecutor(max_workers=GEMINI_MAX_WORKERS + 1)
+        # Commit messages generated ahead of time while the user is at a prompt (or, in auto
+        # mode, for every group at once)
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=max(PREFETCH_GROUPS + 1, GEMINI_MAX_WORKERS))
+        self._prefetched: Dict[Tuple[str, frozenset], Future] = {}
+        # Per-thread console buffer used by _buffered_output
+        self._output = threading.local()
+        # .git/commit-ai/session.jsonl while a commit session is running
+        self._session_journal: Optional[str] = None
         
+    @property
+    def gemini_model(self):
+        """Client for commit messages, reviews and summaries."""
+        return self._model(GEMINI_MODEL)
+
+    @property
+    def classify_model(self):
+        """Client for per-file analysis; the same object as gemini_model unless GEMINI_CLASSIFY_MODEL is set."""
+        return self._model(GEMINI_CLASSIFY_MODEL)
+
+    def _model(self, name: str):
+        """Returns the shared client for a Gemini model, creating it on first use."""
+        with self._model_lock:
+            if name not in self._models:
+                self._models[name] = _load_genai().GenerativeModel(name)
+            return self._models[name]
+
     def _setup_logging(self, repo_path: str) -> None:
         """Sets up logging for the analysis session."""
         # Create logs directory in the current project (where analysis.py is located)
@@ -117,20 +562,26 @@ class EnhancedGitAICommitter:
         # Remove existing handlers
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
+        self._stop_log_listener()
         
         # Create file handler
         file_handler = logging.FileHandler(log_path, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         
-        # Create formatter
-        formatter = logging.Formatter(
+        # Create formatter; color codes are stripped here, on the listener thread
+        formatter = PlainFormatter(
             '%(asctime)s - %(levelname)s - %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(formatter)
         
-        # Add handler to logger
-        self.logger.addHandler(file_handler)
+        # Log records are queued and written by a listener thread, so the analysis
+        # threads never wait on file I/O; stopping the listener at exit drains the queue
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+        self._log_listener.start()
+        atexit.register(self._stop_log_listener)
         
         # Log session start
         self.logger.info("=== Git AI Committer Session Started ===")
@@ -142,136 +593,448 @@ class EnhancedGitAICommitter:
         # Store log path for reference
         self.log_path = log_path
 
+    def _stop_log_listener(self) -> None:
+        """Writes out any queued log records and closes the log file."""
+        listener, self._log_listener = self._log_listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+    @contextmanager
+    def _buffered_output(self):
+        """Collects console output from _log_and_print and writes it in one go on exit.
+
+        The buffer is per thread, so concurrent file analyses print as whole blocks.
+        """
+        if getattr(self._output, 'buffer', None) is not None:
+            yield
+            return
+        self._output.buffer = []
+        try:
+            yield
+        finally:
+            buffer, self._output.buffer = self._output.buffer, None
+            if buffer:
+                sys.stdout.write(''.join(buffer))
+                sys.stdout.flush()
+
     def _log_and_print(self, message: str, level: str = 'info') -> None:
-        """Logs message to file and prints to console."""
-        # Print to console
-        print(message)
+        """Logs message to file and prints to console.
+
+        On a background prefetch thread the message is only logged, since a questionary
+        prompt may own the terminal.
+        """
+        # Print to console, or queue it if a buffered phase is active
+        buffer = getattr(self._output, 'buffer', None)
+        if not getattr(self._output, 'quiet', False):
+            if buffer is not None:
+                buffer.append(f"{message}\n")
+            else:
+                print(message)
         
         # Log to file if logger is set up
         if self.logger:
-            # Remove ANSI color codes for log file
-            clean_message = re.sub(r'\033\[[0-9;]*m', '', message)
-            
             if level.lower() == 'debug':
-                self.logger.debug(clean_message)
+                self.logger.debug(message)
             elif level.lower() == 'warning':
-                self.logger.warning(clean_message)
+                self.logger.warning(message)
             elif level.lower() == 'error':
-                self.logger.error(clean_message)
+                self.logger.error(message)
             else:
-                self.logger.info(clean_message)
+                self.logger.info(message)
+
+    def _run_git_command(self, command: List[str], repo_path: str, text: bool = True,
+                         input=None) -> Optional[subprocess.CompletedProcess]:
+        """Helper to run a git command in the specified repository path.
 
-    def _run_git_command(self, command: List[str], repo_path: str) -> Optional[subprocess.CompletedProcess]:
-        """Helper to run a git command in the specified repository path."""
+        Pass text=False to receive raw bytes (e.g. for NUL-delimited output), and
+        input to feed the command's stdin.
+        """
         try:
-            return subprocess.run(command, check=True, capture_output=True, text=True, cwd=repo_path)
+            return subprocess.run(command, check=True, capture_output=True, text=text, cwd=repo_path, input=input)
         except subprocess.CalledProcessError as e:
             if e.returncode == 1 and "status" in command:
                 return e
-            print(f"{self.colors.FAIL}Error running git command '{' '.join(command)}':\n{e.stderr}{self.colors.ENDC}")
+            stderr = e.stderr if text else os.fsdecode(e.stderr or b'')
+            self._log_and_print(f"{self.colors.FAIL}Error running git command '{' '.join(command)}':\n{stderr}{self.colors.ENDC}", 'error')
             if e.returncode != 1:
                 sys.exit(1)
             return None
 
+    def _run_git_command_head(self, command: List[str], repo_path: str, max_bytes: int) -> Optional[str]:
+        """Runs a git command and returns at most max_bytes of its output, decoded.
+
+        Stops reading and kills git once the cap is reached, so a huge diff is never
+        produced or decoded in full; truncated output ends with a marker. Returns None
+        if the command fails.
+        """
+        with subprocess.Popen(command, cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+            data = process.stdout.read(max_bytes + 1)
+            truncated = len(data) > max_bytes
+            if truncated:
+                process.kill()
+            stderr = process.stderr.read()
+            returncode = process.wait()
+        if not truncated and returncode != 0:
+            self._log_and_print(f"{self.colors.FAIL}Error running git command '{' '.join(command)}':\n{os.fsdecode(stderr)}{self.colors.ENDC}", 'error')
+            return None
+        text = data[:max_bytes].decode('utf-8', errors='ignore')
+        return f"{text}\n...<output truncated at {max_bytes} bytes>..." if truncated else text
+
+    def _call_gemini(self, model, prompt: str, **kwargs):
+        """Calls model.generate_content, retrying only errors that can resolve on their own.
+
+        Calls are paced by rate_limiter. Rate limits (429) wait for as long as the
+        server asks plus a jittered exponential backoff; 503/504 get a short, jittered
+        linear retry. Jitter keeps concurrent workers from retrying in lockstep.
+        Anything else is raised immediately, so callers can fall back without waiting
+        on retries that cannot succeed.
+        """
+        rate_limited = transient = 0
+        while True:
+            self.rate_limiter.acquire(len(prompt) // 4)
+            try:
+                return model.generate_content(prompt, **kwargs)
+            except Exception as e:
+                from google.api_core import exceptions as google_exceptions
+
+                if isinstance(e, google_exceptions.ResourceExhausted) and rate_limited < GEMINI_RATE_LIMIT_RETRIES:
+                    rate_limited += 1
+                    backoff = min(GEMINI_RATE_LIMIT_BASE_DELAY * 2 ** (rate_limited - 1), GEMINI_RATE_LIMIT_MAX_DELAY)
+                    server_delay = min(self._server_retry_delay(e) or 0.0, GEMINI_RATE_LIMIT_MAX_DELAY)
+                    delay = server_delay + random.uniform(0, backoff)
+                elif (isinstance(e, (google_exceptions.ServiceUnavailable, google_exceptions.DeadlineExceeded))
+                      and transient < GEMINI_TRANSIENT_RETRIES):
+                    transient += 1
+                    delay = GEMINI_TRANSIENT_DELAY * transient * random.uniform(0.5, 1.5)
+                else:
+                    raise
+                self._log_and_print(f"   ⏳ {self.colors.WARNING}Gemini {type(e).__name__}, retrying in {delay:.1f}s...{self.colors.ENDC}", 'warning')
+                time.sleep(delay)
+
+    @staticmethod
+    def _server_retry_delay(error) -> Optional[float]:
+        """Seconds the server asked us to wait (RetryInfo detail or Retry-After header), if any."""
+        for detail in getattr(error, 'details', None) or []:
+            retry_delay = getattr(detail, 'retry_delay', None)
+            if retry_delay is not None:
+                return retry_delay.seconds + retry_delay.nanos / 1e9
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            return float(headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+    def _generate_content(self, prompt: str, stream: bool = False, schema=None):
+        """Sends a prompt to Gemini through the shared model client.
+
+        Every Gemini call goes through this helper so the single client (and its
+        underlying connection) is reused for the whole session.
+        With stream=True, text is printed as it arrives; the returned response still
+        exposes the complete text once the stream is drained. A schema constrains the
+        response to JSON of that shape.
+        """
+        generation_config = self._json_config(schema) if schema is not None else None
+        if not stream:
+            response = self._call_gemini(self.gemini_model, prompt, generation_config=generation_config)
+            self._log_token_usage(response)
+            return response
+
+        response = self._call_gemini(self.gemini_model, prompt, generation_config=generation_config, stream=True)
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. finish or safety metadata)
+                continue
+            print(f"{self.colors.OKCYAN}{text}{self.colors.ENDC}", end='', flush=True)
+        print()
+        self._log_token_usage(response)
+        return response
+
+    def _log_token_usage(self, response) -> None:
+        """Logs a response's token counts, including prompt tokens served from Gemini's prefix cache."""
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None or not self.logger:
+            return
+        self.logger.debug(
+            f"Gemini tokens: prompt={usage.prompt_token_count}, "
+            f"cached={getattr(usage, 'cached_content_token_count', 0)}, "
+            f"output={usage.candidates_token_count}"
+        )
+
+    def _generate_cached_text(self, kind: str, prompt: str) -> str:
+        """Returns Gemini's text for a free-form prompt, reusing a cached response for the same prompt."""
+        cache_key = ResponseCache.key(GEMINI_MODEL, kind, prompt)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self._log_and_print(f"⚡ Using cached {kind} response", 'debug')
+            return cached
+        text = self._generate_content(prompt).text
+        if text:
+            self.response_cache.set(cache_key, text)
+        return text
+
+    @staticmethod
+    def _json_config(schema) -> "genai.GenerationConfig":
+        """Generation config that makes Gemini emit JSON matching schema."""
+        return _load_genai().GenerationConfig(response_mime_type="application/json", response_schema=schema)
+
+    def _generate_json_text(self, prompt: str, schema=None) -> str:
+        """Streams a JSON response from the classification model and stops reading once it is complete.
+
+        Returns the text up to the end of the first top-level JSON object or array, or
+        everything received if the stream ends before one closes.
+        """
+        buffer = ""
+        generation_config = self._json_config(schema) if schema is not None else None
+        chunk = None
+        for chunk in self._call_gemini(self.classify_model, prompt, generation_config=generation_config, stream=True):
+            try:
+                buffer += chunk.text
+            except ValueError:
+                continue
+            end = self._json_value_end(buffer)
+            if end != -1:
+                self._log_token_usage(chunk)
+                return buffer[:end].strip()
+        self._log_token_usage(chunk)
+        return buffer.strip()
+
+    def _generate_subject_line(self, prompt: str, echo: bool = False) -> str:
+        """Streams a plain-text response and stops reading once its first content line is complete.
+
+        Blank lines and code fences before it are kept in the returned text. With
+        echo=True the text is printed as it arrives.
+        """
+        buffer = ""
+        end = -1
+        chunk = None
+        for chunk in self._call_gemini(self.gemini_model, prompt, stream=True):
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            start = len(buffer)
+            buffer += text
+            end = self._first_line_end(buffer)
+            if echo:
+                print(f"{self.colors.OKCYAN}{buffer[start:end if end != -1 else None]}{self.colors.ENDC}", end='', flush=True)
+            if end != -1:
+                break
+        if echo:
+            print()
+        self._log_token_usage(chunk)
+        return buffer if end == -1 else buffer[:end]
+
+    @staticmethod
+    def _first_line_end(text: str) -> int:
+        """Returns the index of the newline ending the first non-blank, non-fence line, or -1."""
+        start = 0
+        end = text.find('\n')
+        while end != -1:
+            line = text[start:end].strip()
+            if line and not line.startswith('```'):
+                return end
+            start = end + 1
+            end = text.find('\n', start)
+        return -1
+
+    @staticmethod
+    def _json_value_end(text: str) -> int:
+        """Returns the index just past the first balanced {...} or [...] in text, or -1."""
+        depth = 0
+        in_string = escaped = False
+        for i, char in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"' and depth:
+                in_string = True
+            elif char in '{[':
+                depth += 1
+            elif char in '}]' and depth:
+                depth -= 1
+                if not depth:
+                    return i + 1
+        return -1
+
     def _check_prerequisites(self, repo_path: str) -> None:
-        """Checks if Git is installed and the path is a git repo."""
+        """Checks if Git is installed and the path is inside a git work tree.
+
+        Runs once per repository per session; later commands (e.g. summarize after
+        commit) skip the probe.
+        """
+        if repo_path in self._verified_repos:
+            return
+
         print(f"{self.colors.OKCYAN}Checking prerequisites...{self.colors.ENDC}")
         
-        if not self._run_git_command(["git", "--version"], repo_path):
+        if not GEMINI_API_KEY:
+            print(f"{self.colors.FAIL}Error: GEMINI_API_KEY not configured.{self.colors.ENDC}")
             sys.exit(1)
 
-        if not os.path.isdir(os.path.join(repo_path, '.git')):
-            print(f"{self.colors.FAIL}Error: '{repo_path}' is not a valid git repository.{self.colors.ENDC}")
+        # Start connecting to Gemini now so the handshake overlaps the git check below
+        self._warm_up_model()
+
+        # One probe covers "git is installed", "this is a repository" (including worktrees
+        # and submodules, where .git is a file) and "this is its top level", since
+        # status paths are joined onto repo_path
+        try:
+            result = subprocess.run(["git", "-C", repo_path, "rev-parse", "--is-inside-work-tree", "--show-prefix",
+                                     "--absolute-git-dir"], capture_output=True, text=True)
+        except FileNotFoundError:
+            print(f"{self.colors.FAIL}Error: git is not installed or not on PATH.{self.colors.ENDC}")
             sys.exit(1)
 
-        if not GEMINI_API_KEY:
-            print(f"{self.colors.FAIL}Error: GEMINI_API_KEY not configured.{self.colors.ENDC}")
+        inside_work_tree, prefix, git_dir = (result.stdout.split('\n') + ['', ''])[:3]
+        if result.returncode != 0 or inside_work_tree != "true" or prefix.strip():
+            print(f"{self.colors.FAIL}Error: '{repo_path}' is not the root of a git repository.{self.colors.ENDC}")
             sys.exit(1)
         
+        self._verified_repos.add(repo_path)
+        self._git_dirs[repo_path] = git_dir
         print(f"{self.colors.OKGREEN}Prerequisites met.{self.colors.ENDC}")
 
+    def _warm_up_model(self) -> None:
+        """Opens the Gemini connection in the background while git work proceeds.
+
+        A token count is free and uses the same client as generate_content, so the
+        channel setup and auth handshake overlap with the status scan instead of
+        delaying the first real request.
+        """
+        def warm_up():
+            try:
+                self.gemini_model.count_tokens("ping")
+            except Exception as e:
+                if self.logger:
+                    self.logger.debug(f"Gemini warm-up failed: {e}")
+
+        threading.Thread(target=warm_up, name="gemini-warm-up", daemon=True).start()
+
     def _commit_files(self, repo_path: str, files: List[str], message: str, no_verify: bool = True) -> bool:
         """Stages and commits files with the given message."""
+        # Paths go through stdin, NUL-separated and literal, so no file list is too long for
+        # argv and names with glob characters never match other files. They are encoded
+        # back to the exact bytes _scan_status decoded, including names that are not UTF-8.
+        pathspec = b'\0'.join(os.fsencode(f) for f in files)
         try:
-            self._run_git_command(["git", "add", "--"] + files, repo_path)
+            self._run_git_command(
+                ["git", "--literal-pathspecs", "add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                repo_path, text=False, input=pathspec
+            )
             
-            commit_command = ["git", "commit", "-m", message]
+            # The message goes through stdin, and --quiet skips the diffstat summary git
+            # would otherwise compute for the new commit
+            commit_command = ["git", "commit", "--quiet", "-F", "-"]
             if no_verify:
                 commit_command.append("--no-verify")
             
-            self._run_git_command(commit_command, repo_path)
+            # Messages may quote such file names too; git expects them as UTF-8 text
+            commit_input = message.encode('utf-8', 'replace')
+            if self._run_git_command(commit_command, repo_path, text=False, input=commit_input) is None:
+                raise RuntimeError("git commit failed")
+            self._record_commit(files)
             print(f"{self.colors.OKGREEN}Successfully committed {len(files)} file(s).{self.colors.ENDC}")
             return True
         except Exception as e:
             print(f"{self.colors.FAIL}Error during commit: {e}{self.colors.ENDC}")
-            self._run_git_command(["git", "reset", "HEAD", "--"] + files, repo_path)
+            self._run_git_command(
+                ["git", "--literal-pathspecs", "reset", "--quiet", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                repo_path, text=False, input=pathspec
+            )
             return False
+        finally:
+            # Dropped once git is done, so a patch a prefetch loaded meanwhile is not kept
+            with self._patch_lock:
+                for file_path in files:
+                    self._file_patches.pop(file_path, None)
+
+    def _scan_status(self, repo_path: str) -> Dict[str, List[str]]:
+        """Runs `git status` once and splits entries into deleted, modified and untracked paths.
+
+        Uses the NUL-delimited porcelain format so paths with spaces or quotes are
+        returned verbatim. Staged additions are reported as untracked since they are
+        analyzed as new files.
+        """
+        status = {'deleted': [], 'modified': [], 'untracked': []}
+        status_result = self._run_git_command(
+            ["git", "status", "--porcelain=v1", "-z", "--untracked-files=all"], repo_path, text=False
+        )
+        if not status_result or not status_result.stdout:
+            return status
+
+        # Records are `XY <path>\0`; renames and copies append `<original path>\0`.
+        # Paths are decoded with the filesystem encoding so they round-trip to git unchanged.
+        entries = status_result.stdout.split(b'\0')
+        index = 0
+        while index < len(entries):
+            entry = entries[index]
+            index += 1
+            if len(entry) < 4:
+                continue
 
-    def _get_changed_files(self, repo_path: str) -> List[Dict[str, str]]:
-        """Gets all changed files with their status."""
-        files = []
-        processed_files = set()
-
-        # First, get untracked files explicitly
-        ls_files_result = self._run_git_command(["git", "ls-files", "--others", "--exclude-standard"], repo_path)
-        if ls_files_result and ls_files_result.stdout.strip():
-            for untracked_file in ls_files_result.stdout.strip().split('\n'):
-                if untracked_file and untracked_file not in processed_files:
-                    files.append({'status': '??', 'file': untracked_file})
-                    processed_files.add(untracked_file)
-                    if self.logger:
-                        self.logger.debug(f"Found untracked file: {untracked_file}")
-
-        # Then get tracked files with changes
-        status_result = self._run_git_command(["git", "status", "--porcelain"], repo_path)
-        if status_result and status_result.stdout.strip():
-            for line in status_result.stdout.strip().split('\n'):
-                if not line.strip():
-                    continue
-                    
-                parts = line.strip().split(' ', 1)
-                if len(parts) < 2:
-                    continue
-                    
-                status_code = parts[0]
-                path_info = parts[1]
+            # Status columns are compared as raw bytes; only the path is decoded
+            status_code, index_status, path = entry[:2], entry[:1], os.fsdecode(entry[3:])
+
+            if index_status in (b'R', b'C'):
+                # Renames and copies are followed by the original path; treat as modified
+                index += 1
+                status['modified'].append(path)
+            elif status_code == b'??':
+                status['untracked'].append(path)
+            elif b'D' in status_code:
+                # A file added and then deleted never reached HEAD, so there is nothing to commit
+                if index_status != b'A':
+                    status['deleted'].append(path)
+            elif index_status == b'A':
+                status['untracked'].append(path)
+            else:
+                status['modified'].append(path)
 
-                # Clean up quoted paths
-                if path_info.startswith('"') and path_info.endswith('"'):
-                    path_info = path_info[1:-1]
+            if self.logger:
+                self.logger.debug(f"git status {status_code.decode('ascii', errors='replace')!r}: {path}")
 
-                # Skip deleted files
-                if 'D' in status_code:
-                    continue
+        self._untracked_paths = frozenset(status['untracked'])
+        return status
 
-                # Handle different status codes
-                if status_code.startswith('R'):
-                    # Renamed file: extract new path
-                    if ' -> ' in path_info:
-                        _, new_path = path_info.split(' -> ', 1)
-                        file_to_add = new_path
-                        analysis_status = 'M'  # Treat renamed as modified
-                    else:
-                        file_to_add = path_info
-                        analysis_status = 'M'
-                elif status_code == '??':
-                    # Untracked file (might be duplicate from ls-files)
-                    file_to_add = path_info
-                    analysis_status = '??'
-                elif status_code.strip() in ['A', 'AM']:
-                    # Added files (new to git but staged)
-                    file_to_add = path_info
-                    analysis_status = '??'  # Treat as new file for analysis
-                else:
-                    # Modified files
-                    file_to_add = path_info
-                    analysis_status = 'M'
+    def _has_staged_changes(self, repo_path: str) -> bool:
+        """Returns True if the index differs from HEAD.
 
-                if file_to_add and file_to_add not in processed_files:
-                    files.append({'status': analysis_status, 'file': file_to_add})
-                    processed_files.add(file_to_add)
-                    if self.logger:
-                        self.logger.debug(f"Found {analysis_status} file: {file_to_add} (git status: {status_code})")
+        `git diff --cached --quiet` answers through its exit code and stops at the
+        first difference, so nothing has to be listed or parsed.
+        """
+        result = subprocess.run(["git", "diff", "--cached", "--quiet"], capture_output=True, cwd=repo_path)
+        return result.returncode != 0
+
+    def _unstage_all(self, repo_path: str) -> None:
+        """Unstages everything without refreshing stat data for the whole index.
+
+        A plain `git reset` lstat()s every tracked file afterwards to report unstaged
+        changes; the next `git status` does that anyway. Git before 2.36 has no
+        --no-refresh, but there --quiet already skips the refresh.
+        """
+        result = subprocess.run(["git", "reset", "--quiet", "--no-refresh"], capture_output=True, cwd=repo_path)
+        if result.returncode == 129:
+            self._run_git_command(["git", "reset", "--quiet"], repo_path)
+        elif result.returncode != 0:
+            self._run_git_command(["git", "reset"], repo_path)
+
+    def _get_changed_files(self, repo_path: str, status: Optional[Dict[str, List[str]]] = None) -> List[Dict[str, str]]:
+        """Gets all changed files with their status.
+
+        Accepts a result from _scan_status to avoid running `git status` again.
+        """
+        if status is None:
+            status = self._scan_status(repo_path)
+
+        files = [{'status': '??', 'file': path} for path in status['untracked']]
+        files.extend({'status': 'M', 'file': path} for path in status['modified'])
 
         if self.logger:
             self.logger.info(f"Total files found: {len(files)}")
@@ -280,66 +1043,74 @@ class EnhancedGitAICommitter:
 
         return files
 
-    def _auto_commit_deleted_files(self, repo_path: str) -> None:
-        """Automatically commits deleted files."""
-        status_result = self._run_git_command(["git", "status", "--porcelain"], repo_path)
-        if not status_result or not status_result.stdout:
-            return
-        
-        deleted_files = []
-        for line in status_result.stdout.strip().split('\n'):
-            if line.strip().startswith('D'):
-                deleted_files.append(line.split(maxsplit=1)[1])
-        
-        if deleted_files:
-            print(f"{self.colors.WARNING}Auto-committing {len(deleted_files)} deleted file(s)...{self.colors.ENDC}")
-            self._commit_files(repo_path, deleted_files, "chore: remove deleted files", no_verify=True)
+    def _auto_commit_deleted_files(self, repo_path: str, deleted_files: List[str]) -> bool:
+        """Automatically commits deleted files. Returns True if a commit was made."""
+        if not deleted_files:
+            return False
+
+        print(f"{self.colors.WARNING}Auto-committing {len(deleted_files)} deleted file(s)...{self.colors.ENDC}")
+        return self._commit_files(repo_path, deleted_files, "chore: remove deleted files", no_verify=True)
+
+    def _auto_commit_dependency_updates(self, repo_path: str, all_files: List[str]) -> List[str]:
+        """Automatically commits lock files and generated build output, one commit per bucket.
 
-    def _auto_commit_dependency_updates(self, repo_path: str, all_files: List[str]) -> None:
-        """Automatically commits dependency files."""
-        deps_to_commit = [f for f in all_files if any(dep in f for dep in GENERIC_DEPENDENCY_FILES)]
+        Returns the files that were committed.
+        """
+        committed = []
+        deps_to_commit = [f for f in all_files if DEPENDENCY_FILE_RE.search(f)]
         if deps_to_commit:
             print(f"{self.colors.WARNING}Auto-committing {len(deps_to_commit)} dependency file(s)...{self.colors.ENDC}")
-            self._commit_files(repo_path, deps_to_commit, "chore(deps): update dependencies", no_verify=True)
+            if self._commit_files(repo_path, deps_to_commit, "chore(deps): update dependencies", no_verify=True):
+                committed.extend(deps_to_commit)
+
+        generated_to_commit = [f for f in all_files if GENERATED_FILE_RE.search(f) and f not in deps_to_commit]
+        if generated_to_commit:
+            print(f"{self.colors.WARNING}Auto-committing {len(generated_to_commit)} generated file(s)...{self.colors.ENDC}")
+            if self._commit_files(repo_path, generated_to_commit, "chore(build): regenerate build artifacts", no_verify=True):
+                committed.extend(generated_to_commit)
+        return committed
 
-    def _auto_commit_image_files(self, repo_path: str, all_files: List[str]) -> None:
-        """Automatically commits image files."""
-        image_files = [f for f in all_files if any(f.lower().endswith(ext) for ext in IMAGE_FILE_EXTENSIONS)]
-        if image_files:
-            print(f"{self.colors.WARNING}Auto-committing {len(image_files)} image file(s)...{self.colors.ENDC}")
+    def _auto_commit_image_files(self, repo_path: str, file_infos: List[Dict[str, str]]) -> List[str]:
+        """Automatically commits image files. Returns the files that were committed.
+
+        New and updated images are told apart by the status from the initial scan.
+        """
+        committed = []
+        image_infos = [f for f in file_infos if f['file'].lower().endswith(IMAGE_FILE_EXTENSIONS)]
+        if image_infos:
+            print(f"{self.colors.WARNING}Auto-committing {len(image_infos)} image file(s)...{self.colors.ENDC}")
             
             # Group images by type for better commit messages
-            new_images = []
-            updated_images = []
-            
-            for image_file in image_files:
-                # Check if this is a new file (untracked)
-                status_result = self._run_git_command(["git", "status", "--porcelain", image_file], repo_path)
-                if status_result and status_result.stdout.strip().startswith('??'):
-                    new_images.append(image_file)
-                else:
-                    updated_images.append(image_file)
+            new_images = [f['file'] for f in image_infos if f['status'] == '??']
+            updated_images = [f['file'] for f in image_infos if f['status'] != '??']
             
             # Commit new images
             if new_images:
                 message = f"feat(assets): add {len(new_images)} new image{'s' if len(new_images) > 1 else ''}"
-                self._commit_files(repo_path, new_images, message, no_verify=True)
+                if self._commit_files(repo_path, new_images, message, no_verify=True):
+                    committed.extend(new_images)
             
             # Commit updated images
             if updated_images:
                 message = f"chore(assets): update {len(updated_images)} image{'s' if len(updated_images) > 1 else ''}"
-                self._commit_files(repo_path, updated_images, message, no_verify=True)
+                if self._commit_files(repo_path, updated_images, message, no_verify=True):
+                    committed.extend(updated_images)
+
+        return committed
 
-    def _classify_file_by_pattern(self, file_path: str) -> Set[str]:
-        """Classifies a file based on its path and name patterns."""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _classify_file_by_pattern(file_path: str) -> FrozenSet[str]:
+        """Classifies a file based on its path and name patterns.
+
+        Memoized per path, since a path is classified again by every fallback analysis.
+        """
         classifications = set()
         file_lower = file_path.lower()
         
-        for category, patterns in DEPENDENCY_PATTERNS.items():
-            for pattern in patterns:
-                if pattern.lower() in file_lower:
-                    classifications.add(category)
-                    break
+        for category, pattern_re in DEPENDENCY_PATTERN_RES.items():
+            if pattern_re.search(file_path):
+                classifications.add(category)
         
         # Additional logic for specific file types
         if file_path.endswith(('.ts', '.tsx', '.js', '.jsx')):
@@ -350,14 +1121,32 @@ class EnhancedGitAICommitter:
             classifications.add('template')
         elif file_path.endswith(('.json', '.yaml', '.yml', '.toml')):
             classifications.add('configuration')
-        elif any(file_path.lower().endswith(ext) for ext in IMAGE_FILE_EXTENSIONS):
+        elif file_lower.endswith(IMAGE_FILE_EXTENSIONS):
             classifications.add('assets')
             
-        return classifications
+        return frozenset(classifications)
+
+    def _analyze_single_file(self, repo_path: str, file_info: Dict[str, str], diff: Optional[str] = None) -> Optional[Dict]:
+        """Analyzes a single file using Gemini.
 
-    @retry(tries=3, delay=1, backoff=2)
-    def _analyze_single_file(self, repo_path: str, file_info: Dict[str, str]) -> Optional[Dict]:
-        """Analyzes a single file using Gemini."""
+        `diff` is the file's patch from _diff_all_modified; when omitted, git is queried for it.
+        """
+        try:
+            section, result = self._file_analysis_section(repo_path, file_info, diff)
+            if section is None:
+                return result
+            return self._analyze_file_section(file_info['file'], file_info['status'], section)
+        except Exception as e:
+            self._log_and_print(f"   ❌ {self.colors.FAIL}Unexpected error analyzing {file_info['file']}: {e}{self.colors.ENDC}", 'error')
+            self._log_and_print(f"   🔧 Using fallback analysis...", 'debug')
+            return self._create_fallback_analysis(file_info['file'], file_info['status'])
+
+    def _file_analysis_section(self, repo_path: str, file_info: Dict[str, str],
+                               diff: Optional[str] = None) -> Tuple[Optional[str], Optional[Dict]]:
+        """Builds the prompt section describing one file.
+
+        Returns (section, None), or (None, result) when the file needs no Gemini call.
+        """
         file_path = file_info['file']
         status = file_info['status']
         full_path = os.path.join(repo_path, file_path)
@@ -368,198 +1157,584 @@ class EnhancedGitAICommitter:
         
         if os.path.isdir(full_path):
             self._log_and_print(f"   ⚠️  {self.colors.WARNING}Skipping directory: {file_path}{self.colors.ENDC}", 'warning')
-            return None
+            return None, None
 
         # Check if file exists
         if not os.path.exists(full_path):
             self._log_and_print(f"   ❌ {self.colors.FAIL}File does not exist: {file_path}{self.colors.ENDC}", 'error')
-            return None
-
-        try:
-            if status == '??':  # New file
-                self._log_and_print(f"   📄 Processing new file...", 'debug')
-                try:
-                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                    self._log_and_print(f"   📝 File content length: {len(content)} characters", 'debug')
-                    
-                    if not content.strip():
-                        self._log_and_print(f"   ⚠️  {self.colors.WARNING}Skipping empty file: {file_path}{self.colors.ENDC}", 'warning')
-                        return None
-                except Exception as e:
-                    self._log_and_print(f"   ❌ {self.colors.FAIL}Error reading file {file_path}: {e}{self.colors.ENDC}", 'error')
-                    return None
-                
-                prompt = f"""
-                Analyze this new file: `{file_path}`
-
-                File Content:
-                ```
-                {content[:2000]}{'...' if len(content) > 2000 else ''}
-                ```
-
-                Return ONLY a valid JSON object with:
-                1. "summary": Brief description of the file's purpose
-                2. "keywords": Array of 2-4 keywords categorizing the change
-                3. "feature_area": The main feature/component this file belongs to
-                4. "dependencies": Array of file patterns this might depend on
-                5. "impact_level": "low", "medium", or "high" based on change significance
-                6. "file_type": Type of file (component, utility, config, etc.)
-
-                Example JSON response:
-                {{"summary": "New authentication service with JWT handling", "keywords": ["auth", "service", "jwt"], "feature_area": "authentication", "dependencies": ["config", "types"], "impact_level": "medium", "file_type": "service"}}
-                """
-            else:  # Modified file
-                self._log_and_print(f"   📄 Processing modified file...", 'debug')
-                
-                # First try unstaged changes
-                diff_result = self._run_git_command(["git", "diff", "--", file_path], repo_path)
-                
-                # If no unstaged diff, try staged changes
-                if not diff_result or not diff_result.stdout.strip():
-                    self._log_and_print(f"   🔍 No unstaged changes, checking staged changes...", 'debug')
-                    diff_result = self._run_git_command(["git", "diff", "--cached", "--", file_path], repo_path)
+            return None, None
+
+        # Files whose category is obvious from their path never need a Gemini call
+        fast_analysis = self._fast_classify(file_info)
+        if fast_analysis:
+            self._log_and_print(f"   ⚡ {self.colors.OKGREEN}Classified by path as {fast_analysis['feature_area']}: {file_path}{self.colors.ENDC}")
+            return None, fast_analysis
+
+        if status == '??':  # New file
+            self._log_and_print(f"   📄 Processing new file...", 'debug')
+            size = os.path.getsize(full_path)
+            if size > ANALYSIS_MAX_FILE_BYTES:
+                self._log_and_print(f"   ⚠️  {self.colors.WARNING}File too large for analysis ({size // 1024} KB), classifying by path: {file_path}{self.colors.ENDC}", 'warning')
+                return None, self._create_fallback_analysis(file_path, status)
+            try:
+                content, is_binary = self._read_file_sample(full_path)
+                self._log_and_print(f"   📝 File content length: {len(content)} characters", 'debug')
                 
-                # If still no diff, try diff against HEAD
-                if not diff_result or not diff_result.stdout.strip():
-                    self._log_and_print(f"   🔍 No staged changes, checking against HEAD...", 'debug')
-                    diff_result = self._run_git_command(["git", "diff", "HEAD", "--", file_path], repo_path)
+                if is_binary:
+                    self._log_and_print(f"   ⚡ {self.colors.OKGREEN}Binary file, skipping Gemini: {file_path}{self.colors.ENDC}")
+                    return None, self._binary_analysis(file_path, status)
+
+                if not content.strip():
+                    self._log_and_print(f"   ⚠️  {self.colors.WARNING}Skipping empty file: {file_path}{self.colors.ENDC}", 'warning')
+                    return None, None
+            except Exception as e:
+                self._log_and_print(f"   ❌ {self.colors.FAIL}Error reading file {file_path}: {e}{self.colors.ENDC}", 'error')
+                return None, None
+            
+            section = f"""
+New file: `{file_path}`
+
+File Content:
+```
+{self._truncate_for_llm(content, *ANALYSIS_CHAR_BUDGET)}
+```
+"""
+        else:  # Modified file
+            self._log_and_print(f"   📄 Processing modified file...", 'debug')
+            
+            if diff:
+                self._log_and_print(f"   📦 Using pre-computed patch from batched diff", 'debug')
+                diff_text = diff
+            else:
+                # Staged and unstaged changes together, in one git call
+                base = "HEAD" if self._has_head(repo_path) else EMPTY_TREE_SHA
+                diff_result = self._run_git_command(["git", "diff", base, "--", file_path], repo_path, text=False)
                 
                 if not diff_result:
                     self._log_and_print(f"   ❌ {self.colors.FAIL}Git diff command failed for {file_path}{self.colors.ENDC}", 'error')
-                    return self._create_fallback_analysis(file_path, status)
-                
-                if not diff_result.stdout.strip():
-                    self._log_and_print(f"   ⚠️  {self.colors.WARNING}No diff output found for {file_path}, treating as new file{self.colors.ENDC}", 'warning')
-                    # If no diff found, treat as new file and read content
-                    try:
-                        with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                        
-                        if not content.strip():
-                            self._log_and_print(f"   ⚠️  {self.colors.WARNING}File is empty: {file_path}{self.colors.ENDC}", 'warning')
-                            return None
-                        
-                        self._log_and_print(f"   📝 Reading file content ({len(content)} characters) instead of diff", 'debug')
-                        
-                        prompt = f"""
-                        Analyze this file: `{file_path}` (appears to be new or significantly changed)
-
-                        File Content:
-                        ```
-                        {content[:2000]}{'...' if len(content) > 2000 else ''}
-                        ```
-
-                        Return ONLY a valid JSON object with:
-                        1. "summary": Brief description of the file's purpose or changes
-                        2. "keywords": Array of 2-4 keywords categorizing the file
-                        3. "feature_area": The main feature/component this file belongs to
-                        4. "dependencies": Array of file patterns this might depend on
-                        5. "impact_level": "low", "medium", or "high" based on change significance
-                        6. "change_type": Type of change (new_file, feature, refactor, etc.)
-
-                        Example JSON response:
-                        {{"summary": "New React component for partner offerings display", "keywords": ["react", "component", "partner"], "feature_area": "partner_ui", "dependencies": ["react", "typescript"], "impact_level": "medium", "change_type": "new_file"}}
-                        """
-                    except Exception as e:
-                        self._log_and_print(f"   ❌ {self.colors.FAIL}Error reading file content for {file_path}: {e}{self.colors.ENDC}", 'error')
-                        return self._create_fallback_analysis(file_path, status)
-                else:
-                    self._log_and_print(f"   📝 Diff length: {len(diff_result.stdout)} characters", 'debug')
-                    
-                    prompt = f"""
-                    Analyze changes to file: `{file_path}`
-
-                    Git Diff:
-                    ```diff
-                    {diff_result.stdout[:2000]}{'...' if len(diff_result.stdout) > 2000 else ''}
-                    ```
-
-                    Return ONLY a valid JSON object with:
-                    1. "summary": Brief description of what changed
-                    2. "keywords": Array of 2-4 keywords categorizing the change
-                    3. "feature_area": The main feature/component this change affects
-                    4. "dependencies": Array of file patterns this might affect
-                    5. "impact_level": "low", "medium", or "high" based on change significance
-                    6. "change_type": Type of change (bugfix, feature, refactor, etc.)
-
-                    Example JSON response:
-                    {{"summary": "Fixed authentication token validation logic", "keywords": ["auth", "bugfix", "validation"], "feature_area": "authentication", "dependencies": ["types", "config"], "impact_level": "medium", "change_type": "bugfix"}}
-                    """
-
-            # Generate content with Gemini
-            self._log_and_print(f"   🤖 Sending request to Gemini...", 'debug')
-            self._log_and_print(f"   📝 Prompt length: {len(prompt)} characters", 'debug')
-            
-            response = self.gemini_model.generate_content(prompt)
-            
-            # Validate response
-            if not response:
-                self._log_and_print(f"   ❌ {self.colors.FAIL}No response from Gemini for {file_path}{self.colors.ENDC}", 'error')
-                return self._create_fallback_analysis(file_path, status)
-            
-            if not response.text:
-                self._log_and_print(f"   ❌ {self.colors.FAIL}Empty response text from Gemini for {file_path}{self.colors.ENDC}", 'error')
-                return self._create_fallback_analysis(file_path, status)
-            
-            response_text = response.text.strip()
-            self._log_and_print(f"   📤 Gemini response length: {len(response_text)} characters", 'debug')
-            self._log_and_print(f"   📝 Response preview: {response_text[:100]}{'...' if len(response_text) > 100 else ''}", 'debug')
+                    return None, self._create_fallback_analysis(file_path, status)
+
+                # Only the head and tail reach the prompt; skip decoding the rest
+                diff_text = self._decode_sample(diff_result.stdout)
             
-            # Try to extract JSON from response
-            try:
-                self._log_and_print(f"   🔧 Attempting direct JSON parsing...", 'debug')
-                result = json.loads(response_text)
-                self._log_and_print(f"   ✅ Direct JSON parsing successful", 'debug')
-            except json.JSONDecodeError as e:
-                self._log_and_print(f"   ⚠️  Direct JSON parsing failed: {e}", 'debug')
-                self._log_and_print(f"   🔧 Attempting to extract JSON from markdown...", 'debug')
+            if not diff_text.strip():
+                self._log_and_print(f"   ⚠️  {self.colors.WARNING}No diff output found for {file_path}, treating as new file{self.colors.ENDC}", 'warning')
+                # If no diff found, treat as new file and read content
+                try:
+                    content, is_binary = self._read_file_sample(full_path)
+                    
+                    if is_binary:
+                        return None, self._binary_analysis(file_path, status)
+
+                    if not content.strip():
+                        self._log_and_print(f"   ⚠️  {self.colors.WARNING}File is empty: {file_path}{self.colors.ENDC}", 'warning')
+                        return None, None
+                    
+                    self._log_and_print(f"   📝 Reading file content ({len(content)} characters) instead of diff", 'debug')
+                    
+                    section = f"""
+File: `{file_path}` (appears to be new or significantly changed)
+
+File Content:
+```
+{self._truncate_for_llm(content, *ANALYSIS_CHAR_BUDGET)}
+```
+"""
+                except Exception as e:
+                    self._log_and_print(f"   ❌ {self.colors.FAIL}Error reading file content for {file_path}: {e}{self.colors.ENDC}", 'error')
+                    return None, self._create_fallback_analysis(file_path, status)
+            else:
+                self._log_and_print(f"   📝 Diff length: {len(diff_text)} characters", 'debug')
+
+                # Binary and whitespace-only diffs have nothing for Gemini to read
+                trivial_analysis = self._trivial_diff_analysis(file_path, status, diff_text)
+                if trivial_analysis:
+                    self._log_and_print(f"   ⚡ {self.colors.OKGREEN}{trivial_analysis['summary']}, skipping Gemini{self.colors.ENDC}")
+                    return None, trivial_analysis
                 
-                # Try to extract JSON from markdown code blocks
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-                if json_match:
-                    try:
-                        result = json.loads(json_match.group(1))
-                        self._log_and_print(f"   ✅ JSON extracted from markdown", 'debug')
-                    except json.JSONDecodeError as e:
-                        self._log_and_print(f"   ❌ Failed to parse JSON from markdown: {e}", 'debug')
-                        return self._create_fallback_analysis(file_path, status)
-                else:
-                    self._log_and_print(f"   🔧 Attempting to find JSON-like content...", 'debug')
-                    # Try to find JSON-like content
-                    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                    if json_match:
+                section = f"""
+Modified file: `{file_path}`
+
+Git Diff:
+```diff
+{self._truncate_for_llm(diff_text, *ANALYSIS_CHAR_BUDGET)}
+```
+"""
+
+        return section, None
+
+    @staticmethod
+    def _analysis_cache_key(section: str) -> str:
+        """Cache key for a file section; shared by single-file and batched analysis."""
+        return ResponseCache.key(GEMINI_CLASSIFY_MODEL, ANALYSIS_PROMPT_VERSION, FILE_ANALYSIS_PROMPT_PREFIX + section)
+
+    @staticmethod
+    def _section_content_key(section: str, file_path: str) -> str:
+        """Digest of a file section with its own path removed from the header lines only.
+
+        Two files whose keys match carry the same change; the path is left alone
+        wherever it appears in the content itself.
+        """
+        lines = section.split('\n')
+        for i, line in enumerate(lines):
+            if line.startswith('@@') or line == 'File Content:':
+                break
+            if line.startswith(SECTION_HEADER_PREFIXES):
+                lines[i] = line.replace(file_path, '')
+        return hashlib.blake2b('\n'.join(lines).encode('utf-8', 'surrogateescape'), digest_size=16).hexdigest()
+
+    def _analyze_file_section(self, file_path: str, status: str, section: str,
+                              fallback: bool = True) -> Optional[Dict]:
+        """Sends one file's prompt section to Gemini and validates the JSON analysis.
+
+        When Gemini gives no valid analysis, a fallback analysis is returned, or None
+        with fallback=False.
+        """
+        prompt = FILE_ANALYSIS_PROMPT_PREFIX + section
+
+        # Identical prompts (same model, instructions and file content) reuse a stored analysis
+        cache_key = self._analysis_cache_key(section)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self._log_and_print(f"   ⚡ {self.colors.OKGREEN}Using cached analysis for {file_path}{self.colors.ENDC}")
+            return cached
+
+        # Generate content with Gemini
+        self._log_and_print(f"   🤖 Sending request to Gemini...", 'debug')
+        self._log_and_print(f"   📝 Prompt length: {len(prompt)} characters", 'debug')
+        
+        response_text = self._generate_json_text(prompt, FileAnalysisSchema)
+        
+        # Validate response
+        if not response_text:
+            self._log_and_print(f"   ❌ {self.colors.FAIL}Empty response text from Gemini for {file_path}{self.colors.ENDC}", 'error')
+            return self._create_fallback_analysis(file_path, status) if fallback else None
+        
+        self._log_and_print(f"   📤 Gemini response length: {len(response_text)} characters", 'debug')
+        self._log_and_print(f"   📝 Response preview: {response_text[:100]}{'...' if len(response_text) > 100 else ''}", 'debug')
+        
+        result = self._parse_json_response(response_text)
+        if not isinstance(result, dict):
+            return self._create_fallback_analysis(file_path, status) if fallback else None
+
+        # Validate required fields
+        missing_fields = [field for field in REQUIRED_ANALYSIS_FIELDS if field not in result]
+        
+        if missing_fields:
+            self._log_and_print(f"   ❌ {self.colors.FAIL}Missing required fields: {missing_fields}{self.colors.ENDC}", 'error')
+            return self._create_fallback_analysis(file_path, status) if fallback else None
+        
+        self._log_and_print(f"   ✅ All required fields present", 'debug')
+        
+        # Add file pattern classifications
+        result['file_patterns'] = list(self._classify_file_by_pattern(file_path))
+        self._log_and_print(f"   🏷️  File patterns: {result['file_patterns']}", 'debug')
+        
+        self.response_cache.set(cache_key, result)
+        self._log_and_print(f"   ✅ {self.colors.OKGREEN}Analysis completed successfully for {file_path}{self.colors.ENDC}")
+        return result
+
+    def _analyze_file_batch(self, batch: List[Tuple[Dict[str, str], str]]) -> Dict[str, Dict]:
+        """Analyzes several prepared file sections with a single Gemini request.
+
+        Returns analyses keyed by file path. Files missing from the response, or whose
+        entry fails validation, are left out so the caller can analyze them one by one.
+        """
+        prompt = BATCH_ANALYSIS_PROMPT_PREFIX + "\n---\n".join(section for _, section in batch)
+        paths = [file_info['file'] for file_info, _ in batch]
+        self._log_and_print(f"🤖 Sending batch of {len(batch)} file(s) to Gemini: {', '.join(paths)}", 'debug')
+        self._log_and_print(f"   📝 Prompt length: {len(prompt)} characters", 'debug')
+
+        try:
+            response_text = self._generate_json_text(prompt, BatchAnalysisSchema)
+            parsed = self._parse_json_response(response_text) if response_text else None
+        except Exception as e:
+            self._log_and_print(f"   ❌ {self.colors.FAIL}Batch analysis failed: {e}{self.colors.ENDC}", 'error')
+            return {}
+
+        entries = parsed.get('analyses') if isinstance(parsed, dict) else parsed
+        if not isinstance(entries, list):
+            self._log_and_print(f"   ❌ {self.colors.FAIL}Batch response has no analyses array{self.colors.ENDC}", 'error')
+            return {}
+
+        by_file = {entry.get('file'): entry for entry in entries if isinstance(entry, dict)}
+        results = {}
+        for file_info, section in batch:
+            result = by_file.get(file_info['file'])
+            if not result or any(field not in result for field in REQUIRED_ANALYSIS_FIELDS):
+                continue
+            result.pop('file', None)
+            result['file_patterns'] = list(self._classify_file_by_pattern(file_info['file']))
+            self.response_cache.set(self._analysis_cache_key(section), result)
+            results[file_info['file']] = result
+
+        self._log_and_print(f"   ✅ Batch returned {len(results)}/{len(batch)} valid analyses", 'debug')
+        return results
+
+    def _parse_json_response(self, response_text: str):
+        """Parses the JSON of a Gemini analysis response.
+
+        Analysis requests are schema-constrained (response_mime_type application/json),
+        so the text is either valid JSON or unusable; there is no markdown to strip.
+        Returns None when it does not parse.
+        """
+        try:
+            result = json_loads(response_text)
+            self._log_and_print(f"   ✅ JSON parsing successful", 'debug')
+            return result
+        except json.JSONDecodeError as e:
+            self._log_and_print(f"   ❌ JSON parsing failed: {e}", 'debug')
+            return None
+
+    def _diff_all_modified(self, repo_path: str, files: List[str]) -> Dict[str, str]:
+        """Diffs all modified files in one git invocation and splits the output per file.
+
+        Diffing against HEAD covers staged and unstaged changes together. Uses one line
+        of context to keep the patches (and prompts) small; anything missing from the
+        output falls back to a per-file diff.
+        """
+        if not files:
+            return {}
+
+        diffs = {}
+        base = "HEAD" if self._has_head(repo_path) else EMPTY_TREE_SHA
+        diff_output = self._diff_files(repo_path, ["-U1", base], files)
+        if diff_output:
+            # Split the raw output and decode only the part of each patch a prompt can use
+            diffs.update((path, self._decode_sample(patch)) for path, patch in self._split_diff(diff_output).items())
+
+        self._log_and_print(f"📦 Batched diff covered {len(diffs)}/{len(files)} modified file(s)", 'debug')
+        return diffs
+
+    def _diff_files(self, repo_path: str, args: List[str], files: List[str]) -> bytes:
+        """Returns the raw output of `git diff <args> -- <files>`.
+
+        `git diff` cannot read paths from stdin, so long file lists are split over
+        several invocations to keep each command line under GIT_ARGV_MAX_CHARS.
+        """
+        output = []
+        for chunk in self._chunk_paths(files):
+            diff_result = self._run_git_command(
+                ["git", "--literal-pathspecs", "-c", "core.quotePath=false", "diff", "--no-color", *args, "--", *chunk],
+                repo_path, text=False
+            )
+            if diff_result and diff_result.stdout:
+                output.append(diff_result.stdout)
+        return b"".join(output)
+
+    @staticmethod
+    def _chunk_paths(files: List[str], limit: int = GIT_ARGV_MAX_CHARS):
+        """Yields consecutive slices of files whose combined length stays within limit."""
+        start, size = 0, 0
+        for end, file_path in enumerate(files):
+            if end > start and size + len(file_path) + 1 > limit:
+                yield files[start:end]
+                start, size = end, 0
+            size += len(file_path) + 1
+        if start < len(files):
+            yield files[start:]
+
+    @staticmethod
+    def _split_diff(diff):
+        """Splits multi-file `git diff` output into {path: patch}.
+
+        Accepts text or raw bytes; patches keep the type of diff, paths are always str.
+        """
+        is_bytes = isinstance(diff, bytes)
+        patches = {}
+        headers = list((DIFF_HEADER_BYTES_RE if is_bytes else DIFF_HEADER_RE).finditer(diff))
+        for i, header in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(diff)
+            path = os.fsdecode(header.group(1)) if is_bytes else header.group(1)
+            patches[path] = diff[header.start():end]
+        return patches
+
+    @classmethod
+    def _normalize_diff(cls, diff: str) -> str:
+        """Reduces a diff to the content of its changes, for use as a cache key.
+
+        Files are put in path order, trailing whitespace is dropped and hunk positions
+        and blob hashes are removed, so a rebased or reformatted diff keys the same.
+        """
+        patches = cls._split_diff(diff)
+        return '\n'.join(
+            '' if DIFF_POSITION_LINE_RE.match(line) else line.rstrip()
+            for path in sorted(patches)
+            for line in patches[path].splitlines()
+        )
+
+    def _analyze_files_concurrently(self, repo_path: str, file_infos: List[Dict[str, str]],
+                                    batch_size: int = 0) -> List[Tuple[Dict[str, str], Optional[Dict]]]:
+        """Analyzes files in parallel so Gemini round-trips and git diffs overlap.
+
+        New files start analyzing right away while the batched diff for modified
+        files is still being computed. With batch_size > 1, up to batch_size files are
+        sent to Gemini per request; batch_size 0 picks the smallest size that keeps
+        to one request per worker, capped at MAX_ANALYSIS_BATCH_SIZE. Results are
+        returned in the same order as file_infos.
+        """
+        if batch_size <= 0:
+            batch_size = min(MAX_ANALYSIS_BATCH_SIZE, -(-len(file_infos) // GEMINI_MAX_WORKERS))
+        if batch_size > 1:
+            return self._analyze_files_in_batches(repo_path, file_infos, batch_size)
+
+        modified_files = [f['file'] for f in file_infos if f['status'] != '??']
+        # Each file's output is printed as soon as it completes, with a running count
+        completed = itertools.count(1)
+
+        def analyze(file_info: Dict[str, str]) -> Tuple[Dict[str, str], Optional[Dict]]:
+            with self._buffered_output():
+                try:
+                    diff = diffs.result().get(file_info['file']) if file_info['status'] != '??' else None
+                    analysis = self._analyze_single_file(repo_path, file_info, diff)
+                except Exception as e:
+                    self._log_and_print(f"   ❌ {self.colors.FAIL}Analysis raised for {file_info['file']}: {e}{self.colors.ENDC}", 'error')
+                    analysis = self._create_fallback_analysis(file_info['file'], file_info['status'])
+                self._log_and_print(f"   📈 {next(completed)}/{len(file_infos)} file(s) analyzed")
+                return file_info, analysis
+
+        if not file_infos:
+            return []
+
+        max_workers = min(GEMINI_MAX_WORKERS, len(file_infos))
+        self._log_and_print(f"⚡ Analyzing {len(file_infos)} file(s) with {max_workers} worker(s)...", 'debug')
+        # Submitted first so it always gets a thread before any analysis waits on it
+        diffs = self._analysis_executor.submit(self._diff_all_modified, repo_path, modified_files)
+        # Queue new files first so they fill the workers while git diff runs
+        ordered = sorted(file_infos, key=lambda f: f['status'] != '??')
+        results = dict(zip(map(id, ordered), self._analysis_executor.map(analyze, ordered)))
+        return [results[id(file_info)] for file_info in file_infos]
+
+    def _analyze_files_in_batches(self, repo_path: str, file_infos: List[Dict[str, str]],
+                                  batch_size: int) -> List[Tuple[Dict[str, str], Optional[Dict]]]:
+        """Packs up to batch_size uncached files into each Gemini request.
+
+        Files the batch response does not cover are re-analyzed individually. Files
+        whose sections differ only in their path (the same version bump or license
+        header in several places) are sent once and share the result.
+        """
+        if not file_infos:
+            return []
+
+        diffs = self._diff_all_modified(repo_path, [f['file'] for f in file_infos if f['status'] != '??'])
+
+        def prepare(file_info: Dict[str, str]) -> Tuple[Optional[str], Optional[Dict]]:
+            with self._buffered_output():
+                try:
+                    return self._file_analysis_section(repo_path, file_info, diffs.get(file_info['file']))
+                except Exception as e:
+                    self._log_and_print(f"   ❌ {self.colors.FAIL}Analysis raised for {file_info['file']}: {e}{self.colors.ENDC}", 'error')
+                    return None, self._create_fallback_analysis(file_info['file'], file_info['status'])
+
+        def analyze_batch(batch: List[Tuple[Dict[str, str], str]]) -> None:
+            with self._buffered_output():
+                analyses = self._analyze_file_batch(batch)
+                gemini_sections.update(content_keys[file_path] for file_path in analyses)
+                for file_info, section in batch:
+                    if file_info['file'] not in analyses:
+                        self._log_and_print(f"   🔁 Missing from batch response, analyzing alone: {file_info['file']}", 'debug')
                         try:
-                            result = json.loads(json_match.group(0))
-                            self._log_and_print(f"   ✅ JSON extracted from text", 'debug')
-                        except json.JSONDecodeError as e:
-                            self._log_and_print(f"   ❌ Failed to parse extracted JSON: {e}", 'debug')
-                            return self._create_fallback_analysis(file_path, status)
-                    else:
-                        self._log_and_print(f"   ❌ No JSON found in response", 'debug')
-                        return self._create_fallback_analysis(file_path, status)
-            
-            # Validate required fields
-            required_fields = ["summary", "keywords", "feature_area"]
-            missing_fields = [field for field in required_fields if field not in result]
-            
-            if missing_fields:
-                self._log_and_print(f"   ❌ {self.colors.FAIL}Missing required fields: {missing_fields}{self.colors.ENDC}", 'error')
-                return self._create_fallback_analysis(file_path, status)
-            
-            self._log_and_print(f"   ✅ All required fields present", 'debug')
-            
-            # Add file pattern classifications
+                            analysis = self._analyze_file_section(file_info['file'], file_info['status'], section, fallback=False)
+                        except Exception as e:
+                            self._log_and_print(f"   ❌ {self.colors.FAIL}Analysis raised for {file_info['file']}: {e}{self.colors.ENDC}", 'error')
+                            analysis = None
+                        if analysis is not None:
+                            gemini_sections.add(content_keys[file_info['file']])
+                        else:
+                            analysis = self._create_fallback_analysis(file_info['file'], file_info['status'])
+                        analyses[file_info['file']] = analysis
+                results.update(analyses)
+                self._log_and_print(f"   📈 {len(results)}/{len(file_infos)} file(s) analyzed")
+
+        # Each batch is sent as soon as it fills, while later files are still being prepared
+        results: Dict[str, Optional[Dict]] = {}
+        pending: List[Tuple[Dict[str, str], str]] = []
+        batch_futures = []
+        # Path-independent section digest -> first file sent with it, and the files reusing
+        # its result; digests Gemini answered for in a batch are tracked for this run only
+        sent_sections: Dict[str, str] = {}
+        content_keys: Dict[str, str] = {}
+        gemini_sections: Set[str] = set()
+        duplicates: List[Tuple[str, str, str]] = []
+        for file_info, (section, result) in zip(file_infos, self._analysis_executor.map(prepare, file_infos)):
+            if section is not None:
+                result = self.response_cache.get(self._analysis_cache_key(section))
+                if result is None:
+                    content = self._section_content_key(section, file_info['file'])
+                    if content in sent_sections:
+                        self._log_and_print(f"   ♻️  Same change as {sent_sections[content]}, reusing its analysis: {file_info['file']}", 'debug')
+                        duplicates.append((file_info['file'], section, content))
+                        continue
+                    sent_sections[content] = file_info['file']
+                    content_keys[file_info['file']] = content
+                    pending.append((file_info, section))
+                    if len(pending) == batch_size:
+                        batch_futures.append(self._analysis_executor.submit(analyze_batch, pending))
+                        pending = []
+                    continue
+                self._log_and_print(f"   ⚡ {self.colors.OKGREEN}Using cached analysis for {file_info['file']}{self.colors.ENDC}")
+            results[file_info['file']] = result
+        if pending:
+            batch_futures.append(self._analysis_executor.submit(analyze_batch, pending))
+
+        self._log_and_print(f"⚡ Analyzing uncached files in {len(batch_futures)} batch(es) of up to {batch_size}...", 'debug')
+        for future in batch_futures:
+            future.result()
+        for file_path, section, content in duplicates:
+            original = sent_sections[content]
+            if results.get(original) is None:
+                continue
+            result = dict(results[original])
+            result['summary'] = str(result.get('summary', '')).replace(original, file_path)
             result['file_patterns'] = list(self._classify_file_by_pattern(file_path))
-            self._log_and_print(f"   🏷️  File patterns: {result['file_patterns']}", 'debug')
-            
-            self._log_and_print(f"   ✅ {self.colors.OKGREEN}Analysis completed successfully for {file_path}{self.colors.ENDC}")
-            return result
-            
-        except Exception as e:
-            self._log_and_print(f"   ❌ {self.colors.FAIL}Unexpected error analyzing {file_path}: {e}{self.colors.ENDC}", 'error')
-            self._log_and_print(f"   🔧 Using fallback analysis...", 'debug')
-            return self._create_fallback_analysis(file_path, status)
+            results[file_path] = result
+            # Only a Gemini analysis is cached; fallbacks are left to be retried next run
+            if content in gemini_sections:
+                self.response_cache.set(self._analysis_cache_key(section), result)
+        if duplicates:
+            self._log_and_print(f"   📈 {len(results)}/{len(file_infos)} file(s) analyzed")
+        return [(file_info, results.get(file_info['file'])) for file_info in file_infos]
+
+    def _fast_classify(self, file_info: Dict[str, str]) -> Optional[Dict]:
+        """Classifies files with deterministic path rules, skipping the LLM.
+
+        Returns an analysis for documentation, tests, CI workflows and assets,
+        or None when the file needs a real Gemini analysis.
+        """
+        file_path = file_info['file']
+        file_lower = file_path.lower()
+        parts = file_lower.split('/')
+        file_name = parts[-1]
+        ext = os.path.splitext(file_name)[1]
+
+        if ext in DOC_FILE_EXTENSIONS and not file_name.startswith(('requirements', 'cmakelists')):
+            feature_area, keywords, file_type = "documentation", ["docs"], "documentation"
+        elif parts[0] == '.github' and ext in ('.yml', '.yaml'):
+            feature_area, keywords, file_type = "ci", ["ci"], "workflow"
+        elif ext in IMAGE_FILE_EXTENSIONS or ext in FONT_FILE_EXTENSIONS:
+            feature_area, keywords, file_type = "assets", ["assets"], "asset"
+        elif any(part in TEST_DIR_NAMES for part in parts[:-1]) or TEST_FILE_RE.search(file_name):
+            feature_area, keywords, file_type = "testing", ["test"], "test"
+        else:
+            return None
+
+        return {
+            "summary": f"{'New' if file_info['status'] == '??' else 'Updated'} {file_type} file: {file_path}",
+            "keywords": keywords,
+            "feature_area": feature_area,
+            "dependencies": [],
+            "impact_level": "low",
+            "file_type": file_type,
+            "file_patterns": list(self._classify_file_by_pattern(file_path))
+        }
+
+    def _read_file_sample(self, full_path: str, head: int = FILE_SAMPLE_HEAD,
+                          tail_size: int = FILE_SAMPLE_TAIL) -> Tuple[str, bool]:
+        """Reads the head and tail of a file and decodes them once.
+
+        Files larger than head + tail_size bytes are sampled with two fixed-size
+        reads, so memory use does not grow with file size. Returns (text, is_binary);
+        files with a NUL byte in their first 8 KB are reported as binary with empty text.
+        """
+        size = os.stat(full_path).st_size
+        if size == 0:
+            return "", False
+
+        fd = os.open(full_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            data = os.read(fd, min(size, head))
+            if b'\0' in data[:8192]:
+                return "", True
+            if size > head + tail_size:
+                os.lseek(fd, -tail_size, os.SEEK_END)
+                tail = os.read(fd, tail_size)
+                data += f"\n...<{size - len(data) - len(tail)}{SAMPLE_GAP_MARKER}".encode() + tail
+            elif size > len(data):
+                data += os.read(fd, size - len(data))
+        finally:
+            os.close(fd)
+
+        return data.decode('utf-8', errors='ignore'), False
+
+    @staticmethod
+    def _decode_sample(data: bytes, head: int = FILE_SAMPLE_HEAD, tail_size: int = FILE_SAMPLE_TAIL) -> str:
+        """Decodes the head and tail of raw command output, like _read_file_sample does for files."""
+        if len(data) > head + tail_size:
+            data = data[:head] + f"\n...<{len(data) - head - tail_size}{SAMPLE_GAP_MARKER}".encode() + data[-tail_size:]
+        return data.decode('utf-8', errors='ignore')
+
+    def _binary_analysis(self, file_path: str, status: str) -> Dict:
+        """Canned analysis for binary files, which Gemini cannot meaningfully read."""
+        return {
+            "summary": f"{'New' if status == '??' else 'Updated'} binary asset: {file_path}",
+            "keywords": ["assets"],
+            "feature_area": "assets",
+            "dependencies": [],
+            "impact_level": "low",
+            "file_type": "binary",
+            "file_patterns": list(self._classify_file_by_pattern(file_path))
+        }
+
+    @staticmethod
+    def _trivial_diff_kind(diff_text: str, file_path: str = "") -> Optional[str]:
+        """Returns 'binary' or 'whitespace' for diffs Gemini has nothing to read in, else None.
+
+        Within each run of changed lines, removed and added lines are paired in order and
+        may only differ in leading or trailing whitespace (trailing only, for files where
+        indentation is significant); blank lines may come and go. Whitespace changes
+        inside a line, moved lines and unpaired lines all count as real changes. A
+        sampled diff is never 'whitespace': its skipped middle may change code.
+        """
+        if '\nBinary files ' in diff_text or diff_text.startswith('Binary files '):
+            return 'binary'
+        if SAMPLE_GAP_MARKER in diff_text:
+            return None
+
+        file_lower = file_path.lower()
+        if file_lower.endswith(INDENT_SIGNIFICANT_EXTENSIONS) or os.path.basename(file_lower) in INDENT_SIGNIFICANT_NAMES:
+            normalize = str.rstrip
+        else:
+            normalize = str.strip
+
+        removed: List[str] = []
+        added: List[str] = []
+        changed = in_hunk = False
+        for line in diff_text.splitlines() + [""]:
+            if line.startswith('\\'):  # "\ No newline at end of file" belongs to the run it follows
+                continue
+            if in_hunk and line.startswith('-') and not added:
+                removed.append(normalize(line[1:]))
+            elif in_hunk and line.startswith('+'):
+                added.append(normalize(line[1:]))
+            else:
+                # A context line, hunk header or new run ends the current run of changes
+                if [l for l in removed if l] != [l for l in added if l]:
+                    return None
+                changed = changed or bool(removed or added)
+                removed, added = [], []
+                if in_hunk and line.startswith('-'):
+                    removed.append(normalize(line[1:]))
+                elif line.startswith('@@'):
+                    in_hunk = True
+                elif line.startswith('diff --git '):
+                    in_hunk = False
+        return 'whitespace' if changed else None
+
+    def _trivial_diff_analysis(self, file_path: str, status: str, diff_text: str) -> Optional[Dict]:
+        """Canned analysis for binary diffs and diffs that only change whitespace."""
+        kind = self._trivial_diff_kind(diff_text, file_path)
+        if kind == 'binary':
+            return self._binary_analysis(file_path, status)
+        if kind is None:
+            return None
+
+        analysis = self._create_fallback_analysis(file_path, status)
+        analysis.update({
+            "summary": f"Whitespace-only changes in {file_path}",
+            "keywords": analysis["keywords"] + ["formatting"],
+            "change_type": "style",
+        })
+        return analysis
 
     def _create_fallback_analysis(self, file_path: str, status: str) -> Dict:
         """Creates a fallback analysis when Gemini fails."""
@@ -602,21 +1777,60 @@ class EnhancedGitAICommitter:
             "file_patterns": list(self._classify_file_by_pattern(file_path))
         }
 
-    def _group_files_by_features(self, file_analyses: List[Dict]) -> Dict[str, List[str]]:
-        """Groups files by feature areas and dependencies."""
-        feature_groups = defaultdict(list)
-        dependency_groups = defaultdict(list)
-        
-        # Group by feature area
+    def _union_files_by_keywords(self, file_analyses: List[Dict]) -> Dict[str, List[str]]:
+        """Unions files sharing a feature area or keyword; returns groups named by feature area."""
+        parent = {analysis['file']: analysis['file'] for analysis in file_analyses}
+
+        def find(file: str) -> str:
+            while parent[file] != file:
+                parent[file] = parent[parent[file]]  # Path halving
+                file = parent[file]
+            return file
+
+        first_file_for_key = {}
+        for analysis in file_analyses:
+            file = analysis['file']
+            keys = {f"feature:{analysis.get('feature_area', 'misc')}"}
+            keys.update(
+                f"keyword:{keyword.lower()}" for keyword in analysis.get('keywords', [])
+                if isinstance(keyword, str) and keyword.lower() not in GENERIC_KEYWORDS
+            )
+            for key in keys:
+                if key not in first_file_for_key:
+                    first_file_for_key[key] = file
+                    continue
+                root, other_root = find(first_file_for_key[key]), find(file)
+                if root != other_root:
+                    parent[other_root] = root
+
+        components = defaultdict(list)
         for analysis in file_analyses:
-            feature_area = analysis.get('feature_area', 'misc')
-            feature_groups[feature_area].append(analysis['file'])
+            components[find(analysis['file'])].append(analysis)
+
+        # Name each group after the most common feature area among its files
+        feature_groups = {}
+        for members in components.values():
+            feature_area = Counter(a.get('feature_area', 'misc') for a in members).most_common(1)[0][0]
+            feature_groups[feature_area] = [a['file'] for a in members]
+        return feature_groups
+
+    def _group_files_by_features(self, file_analyses: List[Dict]) -> Dict[str, List[str]]:
+        """Groups files by feature areas and dependencies.
+
+        Feature groups are the connected components of files linked by a shared
+        feature area or a shared (non-generic) keyword, built with union-find so
+        overlapping keywords merge into one larger group instead of several small ones.
+        """
+        feature_groups = self._union_files_by_keywords(file_analyses)
         
-        # Group by dependencies and file patterns
+        # Index analyses by file and group by file patterns in a single pass; plain dicts,
+        # so the lookups below can never create empty groups
+        analysis_by_file: Dict[str, Dict] = {}
+        dependency_groups: Dict[str, List[str]] = {}
         for analysis in file_analyses:
-            file_patterns = analysis.get('file_patterns', [])
-            for pattern in file_patterns:
-                dependency_groups[pattern].append(analysis['file'])
+            analysis_by_file[analysis['file']] = analysis
+            for pattern in analysis.get('file_patterns', []):
+                dependency_groups.setdefault(pattern, []).append(analysis['file'])
         
         # Combine similar groups
         final_groups = {}
@@ -628,11 +1842,12 @@ class EnhancedGitAICommitter:
             else:
                 # Try to merge single files with dependency groups
                 file = files[0]
-                file_analysis = next(a for a in file_analyses if a['file'] == file)
                 merged = False
                 
-                for dep_type, dep_files in dependency_groups.items():
-                    if file in dep_files and len(dep_files) > 1:
+                # Only the file's own patterns can hold it, so look those groups up directly
+                for dep_type in analysis_by_file[file].get('file_patterns', []):
+                    dep_files = dependency_groups[dep_type]
+                    if len(dep_files) > 1:
                         if f"Type: {dep_type}" not in final_groups:
                             final_groups[f"Type: {dep_type}"] = dep_files
                         merged = True
@@ -649,70 +1864,267 @@ class EnhancedGitAICommitter:
         
         return final_groups
 
-    @retry(tries=3, delay=1, backoff=2)
-    def _generate_commit_message_for_group(self, repo_path: str, files: List[str], group_context: str = "") -> Optional[str]:
-        """Generates a commit message for a group of files using Gemini."""
-        print(f"\n{self.colors.OKBLUE}Generating commit message for {len(files)} file(s)...{self.colors.ENDC}")
-        
-        # Stage files temporarily to get diff
-        self._run_git_command(["git", "add", "--"] + files, repo_path)
-        diff_result = self._run_git_command(["git", "diff", "--cached"], repo_path)
-        self._run_git_command(["git", "reset", "HEAD", "--"] + files, repo_path)
+    @staticmethod
+    def _truncate_for_llm(text: str, head: int = 4096, tail: int = 1024) -> str:
+        """Bounds text sent to Gemini, keeping its head and tail around a snip marker."""
+        if len(text) <= head + tail:
+            return text
+        return f"{text[:head]}\n...<snip {len(text) - head - tail} chars>...\n{text[-tail:]}"
 
-        if not diff_result or not diff_result.stdout:
-            return None
+    @staticmethod
+    def _diff_stat(diff: str) -> str:
+        """Summarizes a patch as per-file added/removed line counts.
 
-        prompt = f"""
-        Generate a conventional commit message for these changes:
+        Sent alongside truncated diffs so the model still sees the overall shape of
+        the change when the patch itself is clipped.
+        """
+        stats = []
+        for line in diff.splitlines():
+            if line.startswith('diff --git '):
+                header = DIFF_HEADER_RE.match(line)
+                stats.append([header.group(1) if header else line[11:], 0, 0])
+            elif stats and line.startswith('+') and not line.startswith('+++'):
+                stats[-1][1] += 1
+            elif stats and line.startswith('-') and not line.startswith('---'):
+                stats[-1][2] += 1
+        return '\n        '.join(f"{path} | +{added} -{removed}" for path, added, removed in stats)
+
+    def _combined_patch(self, repo_path: str, files: List[str]) -> str:
+        """Returns the combined diff for a set of files without touching the index.
+
+        Tracked files are diffed against HEAD (staged and unstaged changes together);
+        files _scan_status reported as untracked get a synthetic "new file" patch built
+        from their contents. Patches are memoized per file until that file is committed, so the
+        commit message, the review and any overlapping selection share one git call,
+        even when they are prefetched concurrently.
+        """
+        with self._patch_lock:
+            missing = [f for f in files if f not in self._file_patches]
+            if missing:
+                base = "HEAD" if self._has_head(repo_path) else EMPTY_TREE_SHA
+                patches = self._split_diff(self._diff_files(repo_path, [base], missing))
+                for file_path in missing:
+                    if file_path not in patches:
+                        if file_path in self._untracked_paths:
+                            patches[file_path] = os.fsencode(self._new_file_patch(repo_path, file_path))
+                        else:
+                            # A tracked file whose header git quoted does not parse back to
+                            # its path; its own diff needs no splitting
+                            patches[file_path] = self._diff_files(repo_path, [base], [file_path])
+                    self._file_patches[file_path] = self._compact_patch(file_path, patches.get(file_path, b""))
 
-        Files: {', '.join(files)}
-        Group Context: {group_context}
+            return "".join(self._file_patches[f] for f in files)
 
-        Combined Git Diff:
-        ```diff
-        {diff_result.stdout[:3000]}{'...' if len(diff_result.stdout) > 3000 else ''}
-        ```
+    @classmethod
+    def _compact_patch(cls, file_path: str, patch: bytes) -> str:
+        """Decodes the part of a file's raw patch that is worth sending to the model.
 
-        Requirements:
-        1. Use conventional commit format: type(scope): description
-        2. Types: feat, fix, docs, style, refactor, test, chore
-        3. Keep description under 50 characters
-        4. Add body if needed for complex changes
-        5. Consider the group context when determining scope
+        Lock file and generated file churn is large and carries no signal, so only the
+        file header and its changed line counts are kept; any other patch is capped at
+        FILE_PATCH_CHAR_BUDGET before decoding.
+        """
+        if not patch:
+            return ""
+        if DEPENDENCY_FILE_RE.search(file_path):
+            kind = "lock file"
+        elif GENERATED_FILE_RE.search(file_path):
+            kind = "generated file"
+        else:
+            return cls._decode_sample(patch, *FILE_PATCH_CHAR_BUDGET)
+        lines = patch.splitlines()
+        added = sum(1 for line in lines if line.startswith(b'+') and not line.startswith(b'+++'))
+        removed = sum(1 for line in lines if line.startswith(b'-') and not line.startswith(b'---'))
+        return f"{os.fsdecode(lines[0])}\n# {kind} diff omitted (+{added} -{removed} lines)\n"
 
-        Return ONLY the commit message as plain text, no markdown formatting.
-        Example: "feat(auth): implement JWT token validation"
+    def _has_head(self, repo_path: str) -> bool:
+        """Returns True once the repository has at least one commit.
+
+        A positive answer is remembered per repository, since HEAD cannot go away
+        during a session.
         """
+        if repo_path in self._repos_with_head:
+            return True
+        result = subprocess.run(["git", "rev-parse", "--verify", "--quiet", "HEAD"],
+                                capture_output=True, cwd=repo_path)
+        if result.returncode == 0:
+            self._repos_with_head.add(repo_path)
+        return result.returncode == 0
+
+    def _new_file_patch(self, repo_path: str, file_path: str) -> str:
+        """Builds a unified diff adding file_path, equivalent to diffing against /dev/null.
+
+        Large files contribute only their head and tail, with a marker for the bytes skipped.
+        """
+        content, is_binary = self._read_file_sample(
+            os.path.join(repo_path, file_path), NEW_FILE_PATCH_HEAD, NEW_FILE_PATCH_TAIL
+        )
+
+        header = f"diff --git a/{file_path} b/{file_path}\nnew file mode 100644\n"
+        if is_binary:
+            return f"{header}Binary files /dev/null and b/{file_path} differ\n"
+
+        lines = content.splitlines()
+        body = ''.join(f"+{line}\n" for line in lines)
+        return f"{header}--- /dev/null\n+++ b/{file_path}\n@@ -0,0 +1,{len(lines)} @@\n{body}"
+
+    def _generate_commit_message_for_group(self, repo_path: str, files: List[str], group_context: str = "",
+                                           stream: bool = True) -> Optional[str]:
+        """Generates a commit message for a group of files using Gemini.
+
+        With stream=True the message is printed token by token as Gemini produces it.
+        """
+        if stream:
+            print(f"\n{self.colors.OKBLUE}Generating commit message for {len(files)} file(s)...{self.colors.ENDC}")
+        
+        diff = self._combined_patch(repo_path, files)
+        if not diff:
+            return None
+
+        trivial_kind = self._trivial_group_kind(files)
+        if trivial_kind:
+            subject = os.path.basename(files[0]) if len(files) == 1 else f"{len(files)} files"
+            commit_message = f"{TRIVIAL_COMMIT_PREFIXES[trivial_kind]} {subject}"
+            if stream:
+                print(f"{self.colors.OKCYAN}{commit_message}{self.colors.ENDC}")
+            return commit_message
+
+        prompt = COMMIT_MESSAGE_PROMPT_PREFIX + f"""
+Files: {', '.join(files)}
+Group Context: {group_context}
+
+Diff Stat:
+{self._diff_stat(diff)}
+
+Combined Git Diff:
+```diff
+{self._truncate_for_llm(diff, *GROUP_DIFF_CHAR_BUDGET)}
+```
+"""
+
+        # Keyed by the normalized diff rather than the prompt, so the same changes reuse a
+        # message whatever group name or selection path led to them, and after a rebase
+        cache_key = ResponseCache.key(GEMINI_MODEL, 'commit_message', GROUP_PROMPT_VERSION, self._normalize_diff(diff))
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            if stream:
+                print(f"{self.colors.OKCYAN}{cached}{self.colors.ENDC}")
+            return cached
 
         try:
-            response = self.gemini_model.generate_content(prompt)
+            # Only the subject line is kept, so stop reading as soon as it is complete
+            response_text = self._generate_subject_line(prompt, echo=stream)
             
-            if not response or not response.text:
-                print(f"{self.colors.WARNING}Empty response from Gemini for commit message{self.colors.ENDC}")
+            if not response_text.strip():
+                self._log_and_print(f"{self.colors.WARNING}Empty response from Gemini for commit message{self.colors.ENDC}", 'warning')
                 return self._create_fallback_commit_message(files, group_context)
             
-            # Clean up the response
-            commit_message = response.text.strip()
-            
-            # Remove any markdown formatting
-            commit_message = re.sub(r'```[^`]*```', '', commit_message)
-            commit_message = re.sub(r'`([^`]+)`', r'\1', commit_message)
-            commit_message = commit_message.strip()
+            # Take the first line, skipping any markdown code fence around it
+            lines = [line.strip() for line in response_text.split('\n')]
+            commit_message = next((line for line in lines if line and not line.startswith('```')), '')
             
-            # Take only the first line if multiple lines
-            commit_message = commit_message.split('\n')[0].strip()
+            # Remove any inline markdown formatting
+            commit_message = INLINE_CODE_RE.sub(r'\1', commit_message).strip()
             
             # Validate commit message format
             if not commit_message or len(commit_message) < 10:
-                print(f"{self.colors.WARNING}Invalid commit message format, using fallback{self.colors.ENDC}")
+                self._log_and_print(f"{self.colors.WARNING}Invalid commit message format, using fallback{self.colors.ENDC}", 'warning')
                 return self._create_fallback_commit_message(files, group_context)
             
+            self.response_cache.set(cache_key, commit_message)
             return commit_message
             
         except Exception as e:
-            print(f"{self.colors.FAIL}Error generating commit message: {e}{self.colors.ENDC}")
+            self._log_and_print(f"{self.colors.FAIL}Error generating commit message: {e}{self.colors.ENDC}", 'error')
             return self._create_fallback_commit_message(files, group_context)
 
+    def _trivial_group_kind(self, files: List[str]) -> Optional[str]:
+        """Returns the kind shared by every file in a group that needs no Gemini call, else None.
+
+        Groups of only images or only lock files are recognized by path; otherwise every
+        file's patch must be 'binary' or every one 'whitespace'. Such groups get a fixed
+        commit message; all but 'whitespace', which is a heuristic, also skip the review.
+        Expects the patches to be loaded by _combined_patch; a patch _compact_patch had
+        to sample is never 'whitespace'.
+        """
+        if all(f.lower().endswith(IMAGE_FILE_EXTENSIONS) for f in files):
+            return 'image'
+        if all(DEPENDENCY_FILE_RE.search(f) for f in files):
+            return 'lockfile'
+        kinds = {self._trivial_diff_kind(self._file_patches.get(f, ""), f) for f in files}
+        return kinds.pop() if len(kinds) == 1 else None
+
+    def _prefetch_commit_message(self, repo_path: str, files: List[str], group_context: str = "") -> None:
+        """Starts generating a commit message in the background for a likely selection."""
+        self._submit_prefetch(('message', frozenset(files)), self._generate_commit_message_for_group,
+                              repo_path, files, group_context, False)
+
+    def _prefetch_review(self, repo_path: str, files: List[str]) -> None:
+        """Starts the AI review in the background while the user decides what to do with a commit."""
+        self._submit_prefetch(('review', frozenset(files)), self._get_ai_review, repo_path, files, False)
+
+    @staticmethod
+    def _available_groups(file_groups: Dict[str, List[str]], remaining: Collection[str]) -> List[Dict]:
+        """Returns the smart-group menu entries for groups with more than one uncommitted file."""
+        groups = []
+        for group_name, group_files in file_groups.items():
+            available_files = [f for f in group_files if f in remaining]
+            if len(available_files) > 1:
+                groups.append({"type": "smart_group", "files": available_files, "context": group_name})
+        return groups
+
+    def _prefetch_largest_groups(self, repo_path: str, groups: List[Dict]) -> None:
+        """Prefetches commit messages for the PREFETCH_GROUPS largest of groups."""
+        for group in sorted(groups, key=lambda g: len(g['files']), reverse=True)[:PREFETCH_GROUPS]:
+            self._prefetch_commit_message(repo_path, group['files'], group['context'])
+
+    def _submit_prefetch(self, key: Tuple[str, frozenset], fn, *args) -> None:
+        """Submits fn(*args) to the prefetch pool unless a result for key is already pending."""
+        if key not in self._prefetched:
+            self._prefetched[key] = self._prefetch_executor.submit(self._run_quietly, fn, *args)
+
+    def _run_quietly(self, fn, *args):
+        """Runs fn(*args) with console output from _log_and_print turned off for this thread."""
+        self._output.quiet = True
+        try:
+            return fn(*args)
+        finally:
+            self._output.quiet = False
+
+    def _take_prefetched(self, key: Tuple[str, frozenset]):
+        """Returns the prefetched result for key, waiting if it is still running.
+
+        Returns None if nothing was prefetched (or it had not started yet) or it failed.
+        """
+        future = self._prefetched.pop(key, None)
+        if future is None or future.cancel():
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            self._log_and_print(f"Prefetched {key[0]} failed: {e}", 'debug')
+            return None
+
+    def _take_commit_message(self, repo_path: str, files: List[str], group_context: str = "") -> Optional[str]:
+        """Returns a prefetched commit message for files, generating one if none was started."""
+        message = self._take_prefetched(('message', frozenset(files)))
+        if message:
+            print(f"\n{self.colors.OKCYAN}{message}{self.colors.ENDC}")
+            return message
+        return self._generate_commit_message_for_group(repo_path, files, group_context)
+
+    def _take_review(self, repo_path: str, files: List[str]) -> Optional[List[str]]:
+        """Returns a prefetched review for files, running one now if none was started."""
+        comments = self._take_prefetched(('review', frozenset(files)))
+        if comments is not None:
+            return comments
+        return self._get_ai_review(repo_path, files)
+
+    def _discard_prefetched(self, files: Optional[List[str]] = None) -> None:
+        """Drops prefetched results touching files (all of them when files is None)."""
+        for key in list(self._prefetched):
+            if files is None or not key[1].isdisjoint(files):
+                self._prefetched.pop(key).cancel()
+
     def _create_fallback_commit_message(self, files: List[str], group_context: str = "") -> str:
         """Creates a fallback commit message when Gemini fails."""
         if len(files) == 1:
@@ -742,147 +2154,144 @@ class EnhancedGitAICommitter:
             else:
                 return f"chore: update {len(files)} files"
 
-    @retry(tries=3, delay=1, backoff=2)
-    def _get_ai_review(self, repo_path: str, files: List[str]) -> Optional[List[str]]:
-        """Gets AI code review using Gemini."""
-        print(f"\n{self.colors.OKCYAN}Performing AI code review...{self.colors.ENDC}")
-        
-        self._run_git_command(["git", "add", "--"] + files, repo_path)
-        diff_result = self._run_git_command(["git", "diff", "--cached"], repo_path)
-        self._run_git_command(["git", "reset", "HEAD", "--"] + files, repo_path)
+    def _get_ai_review(self, repo_path: str, files: List[str], stream: bool = True) -> Optional[List[str]]:
+        """Gets AI code review using Gemini.
 
-        if not diff_result or not diff_result.stdout:
+        With stream=True the raw review is printed as it arrives, before it is parsed.
+        """
+        if stream:
+            print(f"\n{self.colors.OKCYAN}Performing AI code review...{self.colors.ENDC}")
+        
+        diff = self._combined_patch(repo_path, files)
+        if not diff:
             return None
 
-        prompt = f"""
-        Perform a code review on these changes:
+        # Binary assets and lock files have nothing to review; whitespace-only groups are
+        # still reviewed, since that classification is a heuristic
+        if self._trivial_group_kind(files) not in (None, 'whitespace'):
+            return []
 
-        Files: {', '.join(files)}
+        prompt = REVIEW_PROMPT_PREFIX + f"""
+Files: {', '.join(files)}
 
-        Git Diff:
-        ```diff
-        {diff_result.stdout[:3000]}{'...' if len(diff_result.stdout) > 3000 else ''}
-        ```
+Diff Stat:
+{self._diff_stat(diff)}
 
-        Review for:
-        1. Logic errors or bugs
-        2. Security vulnerabilities
-        3. Performance issues
-        4. Code style and best practices
-        5. Missing error handling
-        6. Potential side effects
+Git Diff:
+```diff
+{self._truncate_for_llm(diff, *GROUP_DIFF_CHAR_BUDGET)}
+```
+"""
 
-        Return ONLY a JSON array of review comments. If no issues found, return empty array.
-        Example: ["Consider adding error handling for API calls", "This function could benefit from input validation"]
-        """
+        # Keyed by the normalized diff so moved hunks and whitespace-only edits reuse a review
+        cache_key = ResponseCache.key(GEMINI_MODEL, 'review', GROUP_PROMPT_VERSION, self._normalize_diff(diff))
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            response = self.gemini_model.generate_content(prompt)
+            response = self._generate_content(prompt, stream=stream, schema=List[str])
             
             if not response or not response.text:
-                print(f"{self.colors.WARNING}Empty response from Gemini for code review{self.colors.ENDC}")
+                self._log_and_print(f"{self.colors.WARNING}Empty response from Gemini for code review{self.colors.ENDC}", 'warning')
                 return []
             
-            response_text = response.text.strip()
-            
-            # Try to extract JSON from response
-            try:
-                # First try direct JSON parsing
-                result = json.loads(response_text)
-                if isinstance(result, list):
-                    return result
-                else:
-                    print(f"{self.colors.WARNING}Review response is not a list, using fallback{self.colors.ENDC}")
-                    return []
-            except json.JSONDecodeError:
-                # Try to extract JSON from markdown code blocks
-                json_match = re.search(r'```(?:json)?\s*(\[.*?\])\s*```', response_text, re.DOTALL)
-                if json_match:
-                    try:
-                        result = json.loads(json_match.group(1))
-                        if isinstance(result, list):
-                            return result
-                    except json.JSONDecodeError:
-                        pass
-                
-                # Try to find JSON array content
-                json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-                if json_match:
-                    try:
-                        result = json.loads(json_match.group(0))
-                        if isinstance(result, list):
-                            return result
-                    except json.JSONDecodeError:
-                        pass
-                
-                # If no JSON found, try to extract comments from text
-                lines = response_text.split('\n')
-                comments = []
-                for line in lines:
-                    line = line.strip()
-                    if line and not line.startswith('#') and not line.startswith('*'):
-                        # Remove markdown formatting and bullet points
-                        line = re.sub(r'^[-*+]\s*', '', line)
-                        line = re.sub(r'^\d+\.\s*', '', line)
-                        if len(line) > 10:  # Only meaningful comments
-                            comments.append(line)
-                
-                return comments[:5]  # Limit to 5 comments
+            comments, parsed = self._parse_review_comments(response.text.strip())
+            # A malformed response would otherwise pass for "no issues" until the cache expires
+            if parsed:
+                self.response_cache.set(cache_key, comments)
+            return comments
                 
         except Exception as e:
-            print(f"{self.colors.FAIL}Error generating AI review: {e}{self.colors.ENDC}")
+            self._log_and_print(f"{self.colors.FAIL}Error generating AI review: {e}{self.colors.ENDC}", 'error')
             return []
 
-    def test(self, file_path: str, repo_path: str = ".") -> None:
+    def _parse_review_comments(self, response_text: str) -> Tuple[List[str], bool]:
+        """Extracts review comments from a Gemini response (JSON array, fenced JSON or plain text).
+
+        Returns (comments, parsed); parsed is True only when a JSON array was found.
+        """
+        try:
+            # First try direct JSON parsing
+            result = json_loads(response_text)
+            if isinstance(result, list):
+                return result, True
+            else:
+                self._log_and_print(f"{self.colors.WARNING}Review response is not a list, using fallback{self.colors.ENDC}", 'warning')
+                return [], False
+        except json.JSONDecodeError:
+            # Try the first JSON array embedded in the text (e.g. in a markdown code block)
+            start = response_text.find('[')
+            while start != -1:
+                try:
+                    result, _ = JSON_DECODER.raw_decode(response_text, start)
+                    if isinstance(result, list):
+                        return result, True
+                except json.JSONDecodeError:
+                    pass
+                start = response_text.find('[', start + 1)
+            
+            # If no JSON found, try to extract comments from text
+            lines = response_text.split('\n')
+            comments = []
+            for line in lines:
+                line = line.strip()
+                if line and not line.startswith('#') and not line.startswith('*'):
+                    # Remove markdown formatting and bullet points
+                    line = LIST_MARKER_RE.sub('', line)
+                    if len(line) > 10:  # Only meaningful comments
+                        comments.append(line)
+            
+            return comments[:5], False  # Limit to 5 comments
+
+    def test(self, file_path: str, repo_path: str = ".", no_cache: bool = False) -> None:
         """Generates test skeleton for changes in a specific file."""
         abs_repo_path = os.path.abspath(repo_path)
         self._check_prerequisites(abs_repo_path)
+        self.response_cache.enabled = not no_cache
 
         print(f"Generating test skeleton for: {self.colors.OKCYAN}{file_path}{self.colors.ENDC}")
         
-        # Get diff
-        diff_result = self._run_git_command(["git", "diff", "HEAD", "--", file_path], abs_repo_path)
-        if not diff_result or not diff_result.stdout:
-            diff_result = self._run_git_command(["git", "diff", "--", file_path], abs_repo_path)
+        # Get diff, reading no more than the prompt can hold
+        max_bytes = sum(GROUP_DIFF_CHAR_BUDGET)
+        diff = self._run_git_command_head(["git", "diff", "HEAD", "--", file_path], abs_repo_path, max_bytes)
+        if not diff:
+            diff = self._run_git_command_head(["git", "diff", "--", file_path], abs_repo_path, max_bytes)
 
-        if not diff_result or not diff_result.stdout:
+        if not diff:
             print(f"{self.colors.FAIL}No changes found in {file_path}.{self.colors.ENDC}")
             return
 
-        prompt = f"""
-        Generate a comprehensive test skeleton for the changes in `{file_path}`.
+        prompt = TEST_PROMPT_PREFIX + f"""
+File: {file_path}
 
-        Git Diff:
-        ```diff
-        {diff_result.stdout}
-        ```
-
-        Requirements:
-        1. Create test cases for main functionality
-        2. Include edge cases and error scenarios
-        3. Use appropriate testing framework syntax
-        4. Add descriptive test names
-        5. Include setup/teardown if needed
-        6. Add TODO comments for complex logic
-
-        Return the test code as plain text.
-        """
+Git Diff:
+```diff
+{diff}
+```
+"""
 
         try:
-            response = self.gemini_model.generate_content(prompt)
+            test_code = self._generate_cached_text('test', prompt)
             print("\n" + "="*50)
             print(f"{self.colors.HEADER}AI-Generated Test Skeleton{self.colors.ENDC}")
             print("="*50)
-            print(f"{self.colors.OKGREEN}{response.text}{self.colors.ENDC}")
+            print(f"{self.colors.OKGREEN}{test_code}{self.colors.ENDC}")
             print("="*50)
             print(f"{self.colors.WARNING}Note: Review and complete the test logic as needed.{self.colors.ENDC}")
         except Exception as e:
             print(f"{self.colors.FAIL}Error generating test skeleton: {e}{self.colors.ENDC}")
 
-    def summarize(self, base_branch: str = "origin/main", head_branch: Optional[str] = None, repo_path: str = ".") -> None:
-        """Generates PR summary using Gemini."""
+    def summarize(self, base_branch: str = "origin/main", head_branch: Optional[str] = None, repo_path: str = ".",
+                  output_path: Optional[str] = None, no_cache: bool = False) -> None:
+        """Generates PR summary using Gemini.
+
+        With output_path the Markdown summary (or the error) is written to that file
+        instead of the console.
+        """
         abs_repo_path = os.path.abspath(repo_path)
         self._check_prerequisites(abs_repo_path)
+        self.response_cache.enabled = not no_cache
 
         if head_branch is None:
             head_branch_result = self._run_git_command(["git", "rev-parse", "--abbrev-ref", "HEAD"], abs_repo_path)
@@ -890,42 +2299,136 @@ class EnhancedGitAICommitter:
 
         print(f"Generating PR summary for '{self.colors.OKCYAN}{head_branch}{self.colors.ENDC}' against '{self.colors.OKCYAN}{base_branch}{self.colors.ENDC}'...")
         
-        diff_result = self._run_git_command(["git", "diff", f"{base_branch}..{head_branch}"], abs_repo_path)
-        if not diff_result or not diff_result.stdout:
+        diff = self._run_git_command_head(["git", "diff", f"{base_branch}..{head_branch}"], abs_repo_path, 4000)
+        if not diff:
             print(f"{self.colors.WARNING}No differences found.{self.colors.ENDC}")
             return
 
-        prompt = f"""
-        Generate a comprehensive Pull Request summary:
-
-        Branch Diff:
-        ```diff
-        {diff_result.stdout[:4000]}{'...' if len(diff_result.stdout) > 4000 else ''}
-        ```
-
-        Create:
-        1. **Title**: Concise PR title
-        2. **Summary**: High-level overview of changes
-        3. **Changes**: Bulleted list of key modifications
-        4. **Impact**: Potential effects on the system
-        5. **Testing**: Suggested testing approach
-        6. **Deployment**: Any deployment considerations
-
-        Format as clean Markdown.
-        """
+        prompt = PR_SUMMARY_PROMPT_PREFIX + f"""
+Branch Diff:
+```diff
+{diff}
+```
+"""
 
         try:
-            response = self.gemini_model.generate_content(prompt)
+            summary = self._generate_cached_text('pr_summary', prompt)
+            if output_path:
+                Path(output_path).write_text(summary, encoding='utf-8')
+                return
             print("\n" + "="*60)
             print(f"{self.colors.HEADER}AI-Generated Pull Request Summary{self.colors.ENDC}")
             print("="*60)
-            print(f"{self.colors.OKCYAN}{response.text}{self.colors.ENDC}")
+            print(f"{self.colors.OKCYAN}{summary}{self.colors.ENDC}")
             print("="*60)
         except Exception as e:
+            if output_path:
+                Path(output_path).write_text(f"Error generating PR summary: {e}\n", encoding='utf-8')
+                return
             print(f"{self.colors.FAIL}Error generating PR summary: {e}{self.colors.ENDC}")
 
-    @retry(tries=3, delay=1, backoff=2)
-    def summarize_recent(self, hours: int = 1, repo_path: str = ".") -> None:
+    def _state_dir(self, repo_path: str) -> str:
+        """Returns (creating it if needed) the .git/commit-ai directory for per-repository state."""
+        git_dir = self._git_dirs.get(repo_path)
+        if not git_dir:
+            git_dir = self._run_git_command(["git", "rev-parse", "--absolute-git-dir"], repo_path).stdout.strip()
+        state_dir = os.path.join(git_dir, 'commit-ai')
+        os.makedirs(state_dir, exist_ok=True)
+        return state_dir
+
+    def _start_session_journal(self, repo_path: str) -> Optional[Dict]:
+        """Opens .git/commit-ai/session.jsonl and returns the plan a crashed session left in it.
+
+        The journal holds the files and groups of the current plan, followed by one line
+        per commit; it is removed when the session ends normally. The leftover plan comes
+        back with its committed files removed, or None when there is nothing to resume.
+        """
+        self._session_journal = os.path.join(self._state_dir(repo_path), 'session.jsonl')
+        plan = None
+        try:
+            with open(self._session_journal, encoding='utf-8') as journal:
+                for line in journal:
+                    if not line.strip():
+                        continue
+                    entry = json_loads(line)
+                    if 'groups' in entry:
+                        plan = entry
+                    elif plan is not None:
+                        committed = set(entry.get('committed', []))
+                        plan['files'] = [f for f in plan['files'] if f not in committed]
+        except (OSError, ValueError):
+            plan = None
+        return plan if plan and plan.get('files') else None
+
+    def _write_session_plan(self, remaining_files: List[Dict[str, str]], file_analyses: List[Dict],
+                            file_groups: Dict[str, List[str]]) -> None:
+        """Starts the session journal over with a new plan of groups to commit."""
+        if not self._session_journal:
+            return
+        entry = {
+            "files": [f['file'] for f in remaining_files],
+            "analyzed": [analysis['file'] for analysis in file_analyses],
+            "groups": file_groups,
+        }
+        with open(self._session_journal, 'w', encoding='utf-8') as journal:
+            journal.write(json_dumps(entry) + "\n")
+
+    def _record_commit(self, files: List[str]) -> None:
+        """Appends the files of a commit made this session to the session journal."""
+        if not self._session_journal:
+            return
+        with open(self._session_journal, 'a', encoding='utf-8') as journal:
+            journal.write(json_dumps({"committed": files}) + "\n")
+
+    def _end_session_journal(self) -> None:
+        """Removes the session journal once the session ends normally."""
+        if self._session_journal:
+            Path(self._session_journal).unlink(missing_ok=True)
+            self._session_journal = None
+
+    @staticmethod
+    def _resume_session_plan(plan: Dict, remaining_files: List[Dict[str, str]]
+                             ) -> Optional[Tuple[List[Dict], Dict[str, List[str]]]]:
+        """Rebuilds (file_analyses, file_groups) from a leftover plan, skipping analysis.
+
+        Only used when the files still changed are exactly the plan's uncommitted files;
+        commit messages are still generated from the current diffs.
+        """
+        pending = set(plan['files'])
+        if {f['file'] for f in remaining_files} != pending:
+            return None
+        file_analyses = [{'file': f} for f in plan.get('analyzed', []) if f in pending]
+        file_groups = {}
+        for name, files in plan['groups'].items():
+            files = [f for f in files if f in pending]
+            if files:
+                file_groups[name] = files
+        return (file_analyses, file_groups) if file_analyses else None
+
+    def _summarize_in_background(self, repo_path: str, base_branch: str, no_cache: bool = False) -> None:
+        """Runs `summarize` in a detached process that writes the summary under the git directory.
+
+        The commit session returns to the shell immediately instead of waiting on Gemini.
+        """
+        output_dir = self._state_dir(repo_path)
+        output_path = os.path.join(output_dir, 'last-pr-summary.md')
+        log_path = os.path.join(output_dir, 'last-pr-summary.log')
+        # Drop the previous session's summary so a stale one is never mistaken for this one
+        Path(output_path).unlink(missing_ok=True)
+
+        command = [sys.executable, os.path.abspath(__file__), "summarize", f"--base-branch={base_branch}",
+                   f"--repo-path={repo_path}", f"--output-path={output_path}"]
+        if no_cache:
+            command.append("--no-cache")
+        with open(log_path, 'wb') as log_file:
+            subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT,
+                cwd=repo_path, start_new_session=True
+            )
+        self._log_and_print(f"📝 PR summary is being written to {self.colors.OKCYAN}{output_path}{self.colors.ENDC}")
+
+    def summarize_recent(self, hours: int = 1, repo_path: str = ".", no_cache: bool = False) -> None:
         """Summarizes commits from the last N hours using Gemini.
         
         This method analyzes recent git commits and generates a comprehensive development summary
@@ -934,6 +2437,7 @@ class EnhancedGitAICommitter:
         Args:
             hours (int): Number of hours to look back for commits (default: 1)
             repo_path (str): Path to the git repository (default: current directory)
+            no_cache (bool): Ignore cached Gemini responses (default: False)
         
         Usage Examples:
             python analysis.py summarize_recent
@@ -949,6 +2453,7 @@ class EnhancedGitAICommitter:
         """
         abs_repo_path = os.path.abspath(repo_path)
         self._check_prerequisites(abs_repo_path)
+        self.response_cache.enabled = not no_cache
         
         # Setup logging
         self._setup_logging(abs_repo_path)
@@ -979,37 +2484,26 @@ class EnhancedGitAICommitter:
             print(f"{self.colors.FAIL}Failed to get detailed commit information.{self.colors.ENDC}")
             return
         
-        # Get diff for all commits in the time period - handle edge cases
+        # Sample a short patch from each commit, fetched in parallel, instead of one diff of
+        # the whole period that would be cut off after its first few files
         diff_content = ""
         try:
-            # Try to get diff from the oldest commit in the time period
-            if commit_count > 0:
-                # Get the oldest commit hash from the time period
-                oldest_commit_result = self._run_git_command([
-                    "git", "log", f"--since={since_time}", "--no-merges", "--pretty=format:%H", "--reverse"
-                ], abs_repo_path)
-                
-                if oldest_commit_result and oldest_commit_result.stdout.strip():
-                    oldest_commit = oldest_commit_result.stdout.strip().split('\n')[0]
-                    # Get diff from parent of oldest commit to HEAD
-                    diff_result = self._run_git_command([
-                        "git", "diff", f"{oldest_commit}^", "HEAD"
-                    ], abs_repo_path)
-                    
-                    if not diff_result:
-                        # Fallback: try just the oldest commit to HEAD
-                        diff_result = self._run_git_command([
-                            "git", "diff", oldest_commit, "HEAD"
-                        ], abs_repo_path)
-                    
-                    if diff_result and diff_result.stdout:
-                        diff_content = diff_result.stdout
-                    else:
-                        # Final fallback: get diff since time period
-                        diff_result = self._run_git_command([
-                            "git", "diff", f"HEAD@{{{since_time}}}", "HEAD"
-                        ], abs_repo_path)
-                        diff_content = diff_result.stdout if diff_result else ""
+            hashes_result = self._run_git_command([
+                "git", "log", f"--since={since_time}", "--no-merges", "--pretty=format:%H"
+            ], abs_repo_path)
+            commit_hashes = hashes_result.stdout.split() if hashes_result else []
+            if len(commit_hashes) > RECENT_SUMMARY_MAX_COMMITS:
+                step = len(commit_hashes) / RECENT_SUMMARY_MAX_COMMITS
+                commit_hashes = [commit_hashes[int(i * step)] for i in range(RECENT_SUMMARY_MAX_COMMITS)]
+
+            def commit_patch(commit_hash: str) -> str:
+                patch = self._run_git_command_head(
+                    ["git", "show", "--format=", "--no-color", "-U1", commit_hash], abs_repo_path,
+                    RECENT_SUMMARY_DIFF_BYTES // len(commit_hashes)
+                )
+                return f"commit {commit_hash[:7]}\n{patch or ''}".rstrip()
+
+            diff_content = "\n\n".join(self._analysis_executor.map(commit_patch, commit_hashes))
         except Exception as e:
             self._log_and_print(f"Warning: Could not get diff content: {e}", 'warning')
             diff_content = ""
@@ -1023,12 +2517,12 @@ class EnhancedGitAICommitter:
 
         **Commit Information:**
         ```
-        {commit_info[:3000]}{'...' if len(commit_info) > 3000 else ''}
+        {self._truncate_for_llm(commit_info, 2400, 600)}
         ```
 
         **Code Changes:**
         ```diff
-        {diff_content[:2000]}{'...' if len(diff_content) > 2000 else ''}
+        {diff_content}
         ```
 
         **Analysis Requirements:**
@@ -1065,9 +2559,9 @@ class EnhancedGitAICommitter:
         
         try:
             self._log_and_print(f"🤖 Generating AI summary...", 'info')
-            response = self.gemini_model.generate_content(prompt)
+            summary = self._generate_cached_text('recent_summary', prompt)
             
-            if not response or not response.text:
+            if not summary:
                 print(f"{self.colors.FAIL}Failed to generate summary from Gemini.{self.colors.ENDC}")
                 return
             
@@ -1075,14 +2569,14 @@ class EnhancedGitAICommitter:
             print("\n" + "="*80)
             print(f"{self.colors.HEADER}{self.colors.BOLD}🕐 Development Summary - Last {hours} Hour{'s' if hours != 1 else ''}{self.colors.ENDC}")
             print("="*80)
-            print(f"{self.colors.OKCYAN}{response.text}{self.colors.ENDC}")
+            print(f"{self.colors.OKCYAN}{summary}{self.colors.ENDC}")
             print("="*80)
             
             # Also save to log file
             self._log_and_print(f"\n{'='*80}")
             self._log_and_print(f"🕐 Development Summary - Last {hours} Hour{'s' if hours != 1 else ''}")
             self._log_and_print(f"{'='*80}")
-            self._log_and_print(f"{response.text}")
+            self._log_and_print(f"{summary}")
             self._log_and_print(f"{'='*80}")
             
             print(f"\n{self.colors.OKGREEN}✅ Summary generated successfully!{self.colors.ENDC}")
@@ -1093,11 +2587,76 @@ class EnhancedGitAICommitter:
             print(f"{self.colors.FAIL}{error_msg}{self.colors.ENDC}")
             self._log_and_print(error_msg, 'error')
 
+    def _analyze_and_group(self, repo_path: str, remaining_files: List[Dict[str, str]],
+                           analysis_batch_size: int) -> Optional[Tuple[List[Dict], Dict[str, List[str]]]]:
+        """Analyzes the remaining files with Gemini and groups them by feature.
+
+        Returns (file_analyses, file_groups), or None when no file could be analyzed.
+        The plan is written to the session journal so an interrupted session can resume it.
+        """
+        message = f"\n{self.colors.HEADER}Analyzing {len(remaining_files)} file(s) with Gemini...{self.colors.ENDC}"
+        self._log_and_print(message)
+
+        # Log all files to be analyzed
+        with self._buffered_output():
+            self._log_and_print(f"📋 Files queued for analysis:")
+            for i, file_info in enumerate(remaining_files, 1):
+                self._log_and_print(f"   {i}. {file_info['file']} (status: {file_info['status']})")
+
+        # Analyze files with Gemini
+        file_analyses = []
+        successful_analyses = 0
+        failed_analyses = 0
+
+        analysis_results = self._analyze_files_concurrently(repo_path, remaining_files, analysis_batch_size)
+        with self._buffered_output():
+            for file_info, analysis in analysis_results:
+                if analysis and "summary" in analysis:
+                    analysis['file'] = file_info['file']
+                    file_analyses.append(analysis)
+                    successful_analyses += 1
+                    self._log_and_print(f"✅ Analysis successful for: {file_info['file']}")
+                else:
+                    failed_analyses += 1
+                    self._log_and_print(f"❌ Analysis failed for: {file_info['file']}", 'error')
+
+            self._log_and_print(f"\n{'='*60}")
+            self._log_and_print(f"📊 Analysis Summary:")
+            self._log_and_print(f"   ✅ Successful: {successful_analyses}")
+            self._log_and_print(f"   ❌ Failed: {failed_analyses}")
+            self._log_and_print(f"   📝 Total analyzed: {len(file_analyses)}")
+
+        if not file_analyses:
+            self._log_and_print(f"\n{self.colors.WARNING}No files could be analyzed. Reasons could be:", 'warning')
+            self._log_and_print(f"   • Files don't exist in the working directory", 'warning')
+            self._log_and_print(f"   • Files are empty or unreadable", 'warning')
+            self._log_and_print(f"   • Git diff failed to generate output", 'warning')
+            self._log_and_print(f"   • Gemini API is not responding", 'warning')
+            self._log_and_print(f"   • API key issues", 'warning')
+            self._log_and_print(f"   • All responses failed JSON validation", 'warning')
+            self._log_and_print(f"Exiting.{self.colors.ENDC}", 'warning')
+            return None
+
+        # Group files intelligently
+        file_groups = self._group_files_by_features(file_analyses)
+        self._write_session_plan(remaining_files, file_analyses, file_groups)
+        return file_analyses, file_groups
+
     def commit(self, repo_path: str = ".", skip_reset: bool = False, auto_mode: bool = False, 
-               summarize: bool = False, base_branch: str = "origin/main") -> None:
-        """Main command for AI-powered commit process with enhanced file batching."""
+               summarize: bool = False, base_branch: str = "origin/main", analysis_batch_size: int = 0,
+               no_cache: bool = False) -> None:
+        """Main command for AI-powered commit process with enhanced file batching.
+
+        analysis_batch_size sets how many files are sent to Gemini per analysis request;
+        0 (the default) sizes batches from the number of files and GEMINI_MAX_WORKERS.
+        no_cache ignores cached Gemini responses (fresh ones still replace them).
+        """
+        # Imported here: prompt_toolkit is slow to load and only this command is interactive
+        import questionary
+
         abs_repo_path = os.path.abspath(repo_path)
         self._check_prerequisites(abs_repo_path)
+        self.response_cache.enabled = not no_cache
         
         # Setup logging
         self._setup_logging(abs_repo_path)
@@ -1109,107 +2668,109 @@ class EnhancedGitAICommitter:
                 self._log_and_print(f"{self.colors.WARNING}Auto mode cancelled.{self.colors.ENDC}")
                 return
 
+        resume_plan = self._start_session_journal(abs_repo_path)
+
         while True:
-            if not skip_reset:
+            with self._patch_lock:
+                self._file_patches.clear()
+
+            # Scan the working tree while checking the index; usually nothing is staged and
+            # the scan stands, otherwise it is redone after the reset
+            staged = None if skip_reset else self._analysis_executor.submit(self._has_staged_changes, abs_repo_path)
+            status = self._scan_status(abs_repo_path)
+            if staged is not None and staged.result():
                 message = f"{self.colors.OKCYAN}Resetting staged files...{self.colors.ENDC}"
                 self._log_and_print(message)
-                self._run_git_command(["git", "reset"], abs_repo_path)
+                self._unstage_all(abs_repo_path)
+                status = self._scan_status(abs_repo_path)
             
-            # Auto-commit deleted files and dependencies
-            self._auto_commit_deleted_files(abs_repo_path)
-            all_changed_files = self._get_changed_files(abs_repo_path)
-            self._auto_commit_dependency_updates(abs_repo_path, [f['file'] for f in all_changed_files])
-            self._auto_commit_image_files(abs_repo_path, [f['file'] for f in all_changed_files])
+            # Auto-commit deleted files and dependencies from the scan
+            self._auto_commit_deleted_files(abs_repo_path, status['deleted'])
+            all_changed_files = self._get_changed_files(abs_repo_path, status)
+            changed_paths = [f['file'] for f in all_changed_files]
+            committed = set(self._auto_commit_dependency_updates(abs_repo_path, changed_paths))
+            committed.update(self._auto_commit_image_files(
+                abs_repo_path, [f for f in all_changed_files if f['file'] not in committed]))
             
-            # Get remaining files to analyze
-            remaining_files = self._get_changed_files(abs_repo_path)
+            # Files left to analyze: the same scan minus whatever the auto-commits took
+            remaining_files = [f for f in all_changed_files if f['file'] not in committed]
             if not remaining_files:
                 message = f"\n{self.colors.OKGREEN}All changes committed successfully!{self.colors.ENDC}"
                 self._log_and_print(message)
                 break
 
-            message = f"\n{self.colors.HEADER}Analyzing {len(remaining_files)} file(s) with Gemini...{self.colors.ENDC}"
-            self._log_and_print(message)
-            
-            # Log all files to be analyzed
-            self._log_and_print(f"📋 Files queued for analysis:")
-            for i, file_info in enumerate(remaining_files, 1):
-                self._log_and_print(f"   {i}. {file_info['file']} (status: {file_info['status']})")
-            
-            # Analyze files with Gemini
-            file_analyses = []
-            successful_analyses = 0
-            failed_analyses = 0
-            
-            for file_info in remaining_files:
-                self._log_and_print(f"\n{'='*60}")
-                analysis = self._analyze_single_file(abs_repo_path, file_info)
-                if analysis and "summary" in analysis:
-                    analysis['file'] = file_info['file']
-                    file_analyses.append(analysis)
-                    successful_analyses += 1
-                    self._log_and_print(f"✅ Analysis successful for: {file_info['file']}")
-                else:
-                    failed_analyses += 1
-                    self._log_and_print(f"❌ Analysis failed for: {file_info['file']}", 'error')
-
-            self._log_and_print(f"\n{'='*60}")
-            self._log_and_print(f"📊 Analysis Summary:")
-            self._log_and_print(f"   ✅ Successful: {successful_analyses}")
-            self._log_and_print(f"   ❌ Failed: {failed_analyses}")
-            self._log_and_print(f"   📝 Total analyzed: {len(file_analyses)}")
-
-            if not file_analyses:
-                self._log_and_print(f"\n{self.colors.WARNING}No files could be analyzed. Reasons could be:", 'warning')
-                self._log_and_print(f"   • Files don't exist in the working directory", 'warning')
-                self._log_and_print(f"   • Files are empty or unreadable", 'warning')
-                self._log_and_print(f"   • Git diff failed to generate output", 'warning')
-                self._log_and_print(f"   • Gemini API is not responding", 'warning')
-                self._log_and_print(f"   • API key issues", 'warning')
-                self._log_and_print(f"   • All responses failed JSON validation", 'warning')
-                self._log_and_print(f"Exiting.{self.colors.ENDC}", 'warning')
-                break
-
-            # Group files intelligently
-            file_groups = self._group_files_by_features(file_analyses)
+            # An interrupted session's groups are replayed as long as exactly its
+            # uncommitted files are still changed; otherwise the files are analyzed afresh
+            resumed = self._resume_session_plan(resume_plan, remaining_files) if resume_plan else None
+            resume_plan = None
+            if resumed:
+                file_analyses, file_groups = resumed
+                self._log_and_print(
+                    f"\n{self.colors.OKCYAN}Resuming an interrupted session: {len(file_groups)} group(s) "
+                    f"covering {len(file_analyses)} file(s), skipping analysis.{self.colors.ENDC}"
+                )
+            else:
+                analyzed = self._analyze_and_group(abs_repo_path, remaining_files, analysis_batch_size)
+                if analyzed is None:
+                    break
+                file_analyses, file_groups = analyzed
             
             if auto_mode:
-                # Auto-commit the largest/most logical group first
+                # Commit every group from this snapshot, largest first, instead of resetting and
+                # re-scanning after each one. Groups can overlap, so files already committed
+                # are dropped from later groups.
                 sorted_groups = sorted(file_groups.items(), key=lambda x: len(x[1]), reverse=True)
+                committed_files = set()
+
+                # Generate every group's message up front in the background; commits still
+                # run one at a time below, each taking its message as soon as it is ready
+                planned_files = set()
+                for group_name, group_files in sorted_groups:
+                    group_files = [f for f in group_files if f not in planned_files]
+                    if group_files:
+                        self._prefetch_commit_message(abs_repo_path, group_files, group_name)
+                        planned_files.update(group_files)
                 
                 for group_name, group_files in sorted_groups:
+                    group_files = [f for f in group_files if f not in committed_files]
                     if group_files:  # Check if group still has uncommitted files
                         message = f"\n{self.colors.OKBLUE}Auto-committing group: {group_name} ({len(group_files)} files){self.colors.ENDC}"
                         self._log_and_print(message)
                         
-                        commit_message = self._generate_commit_message_for_group(abs_repo_path, group_files, group_name)
+                        commit_message = self._take_commit_message(abs_repo_path, group_files, group_name)
                         if commit_message:
                             self._log_and_print(f"{self.colors.OKGREEN}Generated message: {commit_message}{self.colors.ENDC}")
                             if self._commit_files(abs_repo_path, group_files, commit_message):
-                                break
+                                committed_files.update(group_files)
                         else:
                             self._log_and_print(f"{self.colors.FAIL}Failed to generate commit message for group.{self.colors.ENDC}", 'error')
                             continue
+
+                # Messages planned for groups that changed after a failed commit
+                self._discard_prefetched()
+                if not committed_files:
+                    self._log_and_print(f"{self.colors.FAIL}No group could be committed. Exiting auto mode.{self.colors.ENDC}", 'error')
+                    break
                 continue
 
             # Interactive mode with enhanced grouping
-            remaining_files_to_commit = {analysis['file'] for analysis in file_analyses}
+            # Ordered set (dict keys): O(1) membership while keeping the analysis order for display
+            remaining_files_to_commit = dict.fromkeys(analysis['file'] for analysis in file_analyses)
+            grouped_files = {f for group_files in file_groups.values() if len(group_files) > 1 for f in group_files}
             
             while remaining_files_to_commit:
-                choices = []
-                
                 # Add intelligent groups
-                for group_name, group_files in file_groups.items():
-                    available_files = [f for f in group_files if f in remaining_files_to_commit]
-                    if len(available_files) > 1:
-                        choices.append(questionary.Choice(
-                            title=f"{group_name}: {len(available_files)} files",
-                            value={"type": "smart_group", "files": available_files, "context": group_name}
-                        ))
+                smart_groups = self._available_groups(file_groups, remaining_files_to_commit)
+                choices = [
+                    questionary.Choice(title=f"{group['context']}: {len(group['files'])} files", value=group)
+                    for group in smart_groups
+                ]
+
+                # Generate the largest groups' messages while the user reads the menu
+                self._prefetch_largest_groups(abs_repo_path, smart_groups)
                 
                 # Add individual files
-                individual_files = [f for f in remaining_files_to_commit 
-                                  if not any(f in group_files for group_files in file_groups.values() if len(group_files) > 1)]
+                individual_files = [f for f in remaining_files_to_commit if f not in grouped_files]
                 
                 if individual_files:
                     choices.append(questionary.Separator())
@@ -1226,6 +2787,8 @@ class EnhancedGitAICommitter:
                 selection = questionary.select("Choose files to commit:", choices=choices).ask()
                 
                 if not selection or selection['type'] == 'exit':
+                    self._discard_prefetched()
+                    self._end_session_journal()
                     self._log_and_print(f"{self.colors.WARNING}Exiting commit session.{self.colors.ENDC}")
                     return
 
@@ -1247,8 +2810,8 @@ class EnhancedGitAICommitter:
                 if not selected_files:
                     continue
 
-                # Generate commit message
-                commit_message = self._generate_commit_message_for_group(abs_repo_path, selected_files, context)
+                # Generate commit message, reusing one prefetched for this selection
+                commit_message = self._take_commit_message(abs_repo_path, selected_files, context)
                 if not commit_message:
                     self._log_and_print(f"{self.colors.WARNING}Failed to generate commit message.{self.colors.ENDC}", 'warning')
                     continue
@@ -1261,21 +2824,29 @@ class EnhancedGitAICommitter:
                     self._log_and_print(f"  • {f}")
                 self._log_and_print("-" * 50)
 
+                # Review the same diff in the background so "Get AI Review" answers at once
+                self._prefetch_review(abs_repo_path, selected_files)
+
+                # Assume this selection gets committed and start on the next menu's largest groups
+                self._prefetch_largest_groups(
+                    abs_repo_path, self._available_groups(file_groups, remaining_files_to_commit.keys() - set(selected_files))
+                )
+
                 # Get user action
                 action = questionary.select(
                     "What would you like to do?",
                     choices=["Commit", "Edit Message", "Get AI Review", "Skip"]
                 ).ask()
 
-                if action == "Commit":
-                    if self._commit_files(abs_repo_path, selected_files, commit_message):
-                        remaining_files_to_commit.difference_update(selected_files)
-                elif action == "Edit Message":
-                    edited_message = questionary.text("Edit commit message:", default=commit_message).ask()
-                    if edited_message and self._commit_files(abs_repo_path, selected_files, edited_message):
-                        remaining_files_to_commit.difference_update(selected_files)
+                if action in ("Commit", "Edit Message"):
+                    if action == "Edit Message":
+                        commit_message = questionary.text("Edit commit message:", default=commit_message).ask()
+                    if commit_message and self._commit_files(abs_repo_path, selected_files, commit_message):
+                        for f in selected_files:
+                            remaining_files_to_commit.pop(f, None)
+                        self._discard_prefetched(selected_files)
                 elif action == "Get AI Review":
-                    review_comments = self._get_ai_review(abs_repo_path, selected_files)
+                    review_comments = self._take_review(abs_repo_path, selected_files)
                     if review_comments:
                         self._log_and_print(f"\n{self.colors.HEADER}AI Review Comments:{self.colors.ENDC}")
                         for comment in review_comments:
@@ -1286,14 +2857,18 @@ class EnhancedGitAICommitter:
                 # Skip - do nothing, continue loop
                 
             break  # Exit main loop when all files are committed
+
+        self._end_session_journal()
         
         if summarize:
             self._log_and_print(f"\n{self.colors.HEADER}Generating post-commit summary...{self.colors.ENDC}")
-            self.summarize(base_branch=base_branch, repo_path=abs_repo_path)
+            self._summarize_in_background(abs_repo_path, base_branch, no_cache)
         
+        self._log_and_print(f"🗄️  Response cache: {self.response_cache.hits} hit(s), {self.response_cache.misses} miss(es)", 'debug')
         if self.logger:
             self.logger.info("=== Git AI Committer Session Completed ===")
 
 
 if __name__ == "__main__":
+    import fire
     fire.Fire(EnhancedGitAICommitter)